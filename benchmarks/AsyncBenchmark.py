@@ -0,0 +1,52 @@
+import asyncio
+from time import perf_counter
+
+from ..core import format_, render_async
+from .Timing import report
+
+format_str = 'user {user} in {city}: {balance:,.2f} ({status}), last seen {seen}'
+delays = {'user': 0.02, 'city': 0.05, 'balance': 0.03, 'status': 0.01, 'seen': 0.04}
+values = {'user': 'bob', 'city': 'Leeds', 'balance': 1234.5, 'status': 'active', 'seen': 'today'}
+
+
+async def lookup(key):
+    """
+    a stand-in for a cache service on localhost: answers after a fixed delay per key
+    """
+    await asyncio.sleep(delays[key])
+    return values[key]
+
+
+async def serial():
+    return format_(format_str, **{key: await lookup(key) for key in delays})
+
+
+async def concurrent(limit=None):
+    return await render_async(format_str, kwargs={key: lookup(key) for key in delays}, limit=limit)
+
+
+def milliseconds(coroutine_function, repeat=5):
+    async def run():
+        times = []
+        for _ in range(repeat):
+            start = perf_counter()
+            await coroutine_function()
+            times.append(perf_counter() - start)
+        return min(times) * 1000
+    return asyncio.run(run())
+
+
+def run():
+    expected = format_str.format(**values)
+    assert asyncio.run(serial()) == expected
+    assert asyncio.run(concurrent()) == expected
+    report([('sum of waits', '{:.0f}'.format(sum(delays.values()) * 1000)),
+            ('max of waits', '{:.0f}'.format(max(delays.values()) * 1000)),
+            ('await each, then format_', '{:.1f}'.format(milliseconds(serial))),
+            ('render_async', '{:.1f}'.format(milliseconds(concurrent))),
+            ('render_async limit=2', '{:.1f}'.format(milliseconds(lambda: concurrent(2))))],
+           ('strategy', 'ms'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
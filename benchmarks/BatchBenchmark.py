@@ -0,0 +1,39 @@
+from time import perf_counter
+
+from ..core import format_, format_many, get_template
+from .Timing import report
+
+cases = [
+    ('positional', '{:>8} | {:<12} | {:10.2f}', [(i, 'item{}'.format(i), i / 3) for i in range(100000)]),
+    ('keyword', '{id:>8} | {name!r:>12}', [{'id': i, 'name': 'item{}'.format(i)} for i in range(100000)]),
+]
+
+
+def rows_per_second(function, rows):
+    start = perf_counter()
+    function(rows)
+    return len(rows) / (perf_counter() - start)
+
+
+def run():
+    results = []
+    for name, format_str, rows in cases:
+        template = get_template(format_str)
+        args = rows[0] if isinstance(rows[0], tuple) else ()
+        kwargs = rows[0] if isinstance(rows[0], dict) else {}
+        assert format_many(format_str, rows[:1]) == [format_str.format(*args, **kwargs)]
+
+        if args:
+            naive = rows_per_second(lambda rows: [format_(format_str, *row) for row in rows], rows)
+            builtin = rows_per_second(lambda rows: [format_str.format(*row) for row in rows], rows)
+        else:
+            naive = rows_per_second(lambda rows: [format_(format_str, **row) for row in rows], rows)
+            builtin = rows_per_second(lambda rows: [format_str.format(**row) for row in rows], rows)
+        batch = rows_per_second(template.format_many, rows)
+        results.append((name, '{:,.0f}'.format(builtin), '{:,.0f}'.format(naive), '{:,.0f}'.format(batch),
+                        '{:.1f}x'.format(batch / naive)))
+    report(results, ('template', 'str.format rows/s', 'format_ loop rows/s', 'format_many rows/s', 'speedup'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
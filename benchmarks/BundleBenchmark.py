@@ -0,0 +1,37 @@
+import os
+import tempfile
+from time import perf_counter
+
+from ..core import compile_
+from ..core.Bundle import TemplateBundle, write_bundle
+from .Timing import report
+
+
+def run(count=5000):
+    templates = ['Order {} for {name.first} {name.last}: {qty:>6} x {price:10.2f} [{id%d}] {{%d}}' % (i, i)
+                 + ' lorem ipsum dolor sit amet' * (i % 20) for i in range(count)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'templates.bundle')
+        write_bundle(path, templates, compile_)
+
+        start = perf_counter()
+        for format_str in templates:
+            compile_(format_str)
+        compiled = perf_counter() - start
+
+        start = perf_counter()
+        bundle = TemplateBundle(path)
+        opened = perf_counter() - start
+        for format_str in templates:
+            bundle.get(format_str)
+        loaded = perf_counter() - start
+        bundle.close()
+
+    report([('compile every template', '{:.1f}'.format(compiled * 1e3)),
+            ('open bundle', '{:.1f}'.format(opened * 1e3)),
+            ('open bundle and load every template', '{:.1f}'.format(loaded * 1e3))],
+           ('{} templates'.format(count), 'ms'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
@@ -0,0 +1,46 @@
+from ..core import BufferPool, format_, get_template, render_bytes
+from .Timing import ns_per_op, report
+
+cases = [
+    ('status line', 'HTTP/1.1 {} {}\r\nContent-Length: {}\r\n\r\n', (200, 'OK', 1234)),
+    ('literal-heavy', '<div class="row">' * 40 + '{}</div>', ('x',)),
+    ('non-ASCII literal-heavy', '<p>héllo wörld, 日本語のテキスト</p>' * 20 + '{}', ('x',)),
+    ('field-heavy', ' '.join('{%d}' % (i % 10) for i in range(50)), tuple(range(10))),
+]
+
+
+def run():
+    """
+    compares render_bytes with format_(...).encode(), and the function from compile_bytes
+    with the one from compile followed by encode(), which skips the cache lookup of both
+    """
+    pool = BufferPool()
+    results = []
+    for name, format_str, args in cases:
+        expected = format_str.format(*args).encode()
+        buffer = bytearray()
+        view = render_bytes(format_str, buffer, *args)
+        assert view == expected, name
+        view.release()
+        template = get_template(format_str)
+        render = template.compile()
+        render_to = template.compile_bytes()
+
+        def pooled():
+            with pool.buffer() as buffer:
+                render_bytes(format_str, buffer, *args).release()
+
+        encode = ns_per_op(lambda: format_(format_str, *args).encode())
+        fresh = ns_per_op(lambda: render_bytes(format_str, bytearray(), *args))
+        reused = ns_per_op(pooled)
+        compiled = ns_per_op(lambda: render(*args).encode())
+        compiled_bytes = ns_per_op(lambda: render_to(bytearray(), *args))
+        results.append((name, '{:.0f}'.format(encode), '{:.0f}'.format(fresh), '{:.0f}'.format(reused),
+                        '{:.2f}x'.format(encode / fresh), '{:.0f}'.format(compiled), '{:.0f}'.format(compiled_bytes),
+                        '{:.2f}x'.format(compiled / compiled_bytes)))
+    report(results, ('template', 'format_().encode() ns', 'render_bytes ns', 'pooled ns', 'speedup',
+                     'compile()().encode() ns', 'compile_bytes()() ns', 'speedup'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
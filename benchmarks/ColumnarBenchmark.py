@@ -0,0 +1,41 @@
+from random import Random
+from time import perf_counter
+
+from ..core import format_columns, get_template
+from .Timing import report
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def rows_per_second(function, rows):
+    start = perf_counter()
+    function()
+    return rows / (perf_counter() - start)
+
+
+def run(rows=200000):
+    random = Random(0)
+    format_str = '{id:>8d} {price:10.2f} {qty:,}'
+    columns = {'id': list(range(rows)),
+               'price': [random.uniform(0, 1000) for _ in range(rows)],
+               'qty': [random.randrange(10 ** 6) for _ in range(rows)]}
+    dict_rows = [dict(zip(columns, row)) for row in zip(*columns.values())]
+    template = get_template(format_str)
+    assert format_columns(format_str, columns) == [format_str.format(**row) for row in dict_rows]
+
+    results = [
+        ('str.format loop', rows_per_second(lambda: [format_str.format(**row) for row in dict_rows], rows)),
+        ('format_many', rows_per_second(lambda: template.format_many(dict_rows), rows)),
+        ('format_columns (lists)', rows_per_second(lambda: format_columns(format_str, columns), rows)),
+    ]
+    if numpy is not None:
+        arrays = {name: numpy.array(column) for name, column in columns.items()}
+        results.append(('format_columns (numpy)', rows_per_second(lambda: format_columns(format_str, arrays), rows)))
+    report([(name, '{:,.0f}'.format(speed)) for name, speed in results], ('engine', 'rows/s'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
@@ -0,0 +1,36 @@
+from collections import namedtuple
+
+from ..core import get_template
+from .Timing import ns_per_op, report
+
+Point = namedtuple('Point', 'x y')
+
+cases = [
+    ('literal', 'no replacement fields at all', (), {}),
+    ('positional', '{} and {} and {}', ('milk', 'eggs', 'ham'), {}),
+    ('keyword', 'Units destroyed: {players[0]} of {total}', (), {'players': [1, 2, 3], 'total': 9}),
+    ('getters', '{0.x[1]} {0.y!r}', (Point([0, 2], 'five'),), {}),
+    ('spec', '{:>10} {:8.3f} {:,}', ('eggs', 3.14159, 1234567), {}),
+    ('nested spec', 'milk and {:.>{}}', ('eggs', 10), {}),
+]
+
+
+def run():
+    rows = []
+    for name, format_str, args, kwargs in cases:
+        template = get_template(format_str)
+        function = template.compile()
+        expected = format_str.format(*args, **kwargs)
+        assert template.format(*args, **kwargs) == expected, name
+        assert function(*args, **kwargs) == expected, name
+
+        builtin = ns_per_op(lambda: format_str.format(*args, **kwargs))
+        tree = ns_per_op(lambda: template.format(*args, **kwargs))
+        compiled = ns_per_op(lambda: function(*args, **kwargs))
+        rows.append((name, '{:.0f}'.format(builtin), '{:.0f}'.format(tree), '{:.0f}'.format(compiled),
+                     '{:.1f}x'.format(tree / compiled)))
+    report(rows, ('template', 'str.format ns', 'tree ns', 'compiled ns', 'speedup'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
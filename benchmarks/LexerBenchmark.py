@@ -0,0 +1,23 @@
+from ..core import compile_
+from ..core.Lexer import Lexer
+from .Timing import ns_per_op, report
+
+paragraph = 'Dear customer, your order has shipped and should arrive shortly. ' * 16
+cases = [
+    ('literal 64KB', (paragraph + '{{escaped}}\n') * 60),
+    ('literal + fields 64KB', (paragraph + '{name} {{escaped}} {order.id:>10}\n') * 60),
+    ('fields 32KB', '{a:>10} {b.c[0]} {identifier_name} ' * 1000),
+]
+
+
+def run():
+    rows = []
+    for name, format_str in cases:
+        lex = ns_per_op(lambda: Lexer(format_str).tokens, repeat=3)
+        compile_time = ns_per_op(lambda: compile_(format_str), repeat=3)
+        rows.append((name, len(format_str), '{:.2f}'.format(lex / 1e6), '{:.2f}'.format(compile_time / 1e6)))
+    report(rows, ('template', 'chars', 'lex ms', 'compile ms'))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
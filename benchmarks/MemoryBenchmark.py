@@ -0,0 +1,17 @@
+import tracemalloc
+
+from ..core import compile_
+
+
+def run(count=10000):
+    templates = ['Order {} for {name.first} {name.last}: {qty:>6} x {price:10.2f} [{id%d}] {{%d}}' % (i, i)
+                 for i in range(count)]
+    tracemalloc.start()
+    compiled = [compile_(format_str) for format_str in templates]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('{} compiled templates: {:.1f} MB retained, {:.1f} MB peak'.format(len(compiled), size / 1e6, peak / 1e6))
+
+
+if __name__ == '__main__':
+    run()
\ No newline at end of file
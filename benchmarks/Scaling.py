@@ -0,0 +1,109 @@
+import argparse
+import math
+import sys
+from collections import namedtuple
+
+from ..core import compile_
+from .Timing import ns_per_op, report
+
+# generate(n) returns the format string, args and kwargs for size n. reference is False for
+# shapes that str.format itself refuses to render (it stops at two levels of nesting); their
+# output is checked against the compiled renderer instead.
+Shape = namedtuple('Shape', 'name generate reference')
+
+shapes = [
+    Shape('literal length', lambda n: ('x' * n + '{}', ('end',), {}), True),
+    Shape('escaped braces', lambda n: ('{{}}' * n + '{}', ('end',), {}), True),
+    Shape('field count', lambda n: ('{} ' * n, tuple(range(n)), {}), True),
+    Shape('keyword count', lambda n: keyword_fields(n), True),
+    Shape('getter chain', lambda n: ('{0' + '[0]' * n + '}', (nested_list(n),), {}), True),
+    Shape('spec inners', lambda n: ('{:' + '{}' * n + '}', ('x',) + ('',) * n, {}), True),
+    Shape('nesting depth', lambda n: nested_fields(n), False),
+]
+
+
+def keyword_fields(count):
+    return ''.join('{k%d}' % i for i in range(count)), (), {'k%d' % i: i for i in range(count)}
+
+
+def nested_fields(depth):
+    # every level formats 1 with the spec '1', except the outermost two: 'x   ' whatever the depth
+    return ''.join('{%d:' % i for i in range(depth)) + '}' * depth, ('x', 4) + (1,) * (depth - 2), {}
+
+
+def nested_list(depth):
+    value = 'leaf'
+    for _ in range(depth):
+        value = [value]
+    return value
+
+
+def slope(points):
+    """
+    least-squares slope of log(time) against log(size): about 1 for linear growth, 2 for quadratic
+    """
+    xs = [math.log(size) for size, _ in points]
+    ys = [math.log(time) for _, time in points]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+
+def measure(shape, sizes, repeat):
+    """
+    returns {'compile': [(size, ns)], 'render': [(size, ns)]}, stopping at the first size
+    that raises (for example RecursionError) and recording that as 'failed'
+    """
+    results = {'compile': [], 'render': [], 'failed': None}
+    for size in sizes:
+        format_str, args, kwargs = shape.generate(size)
+        try:
+            template = compile_(format_str)
+            results['compile'].append((size, ns_per_op(lambda: compile_(format_str), repeat=repeat)))
+            expected = format_str.format(*args, **kwargs) if shape.reference else template.compile()(*args, **kwargs)
+            assert template.format(*args, **kwargs) == expected, (shape.name, size)
+            results['render'].append((size, ns_per_op(lambda: template.format(*args, **kwargs), repeat=repeat)))
+        except Exception as error:
+            results['failed'] = '{} at {}: {}'.format(type(error).__name__, size, error)
+            break
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='fit how compile and render time grow with template size')
+    parser.add_argument('--min-power', type=int, default=4, help='smallest size is 2**this (default: %(default)s)')
+    parser.add_argument('--max-power', type=int, default=10, help='largest size is 2**this (default: %(default)s)')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='flag growth whose log-log slope exceeds 1 + this (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per measurement (default: %(default)s)')
+    parser.add_argument('--only', action='append', help='only run the named shape (repeatable)')
+    options = parser.parse_args(argv)
+
+    sizes = [2 ** power for power in range(options.min_power, options.max_power + 1)]
+    rows = []
+    flagged = []
+    for shape in shapes:
+        if options.only and shape.name not in options.only:
+            continue
+        results = measure(shape, sizes, options.repeat)
+        for phase in ('compile', 'render'):
+            points = results[phase]
+            if len(points) < 2:
+                continue
+            growth = slope(points)
+            verdict = 'super-linear' if growth > 1 + options.tolerance else 'ok'
+            rows.append((shape.name, phase, '{}..{}'.format(points[0][0], points[-1][0]),
+                         '{:.0f}'.format(points[0][1]), '{:.0f}'.format(points[-1][1]), '{:.2f}'.format(growth), verdict))
+            if verdict != 'ok':
+                flagged.append('{} {}: time grows like n^{:.2f}'.format(shape.name, phase, growth))
+        if results['failed']:
+            flagged.append('{}: {}'.format(shape.name, results['failed']))
+    report(rows, ('shape', 'phase', 'sizes', 'first ns', 'last ns', 'slope', ''))
+
+    for message in flagged:
+        print('FLAGGED ' + message)
+    return 1 if flagged else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
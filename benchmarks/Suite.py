@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import sys
+from collections import namedtuple
+
+from ..core import compile_
+from .Timing import ns_per_op, report
+
+Case = namedtuple('Case', 'name format_str args kwargs')
+
+
+class Record:
+    def __init__(self, x, y=None):
+        self.x = x
+        self.y = y
+
+
+paragraph = 'The quick brown fox jumps over the lazy dog. ' * 20
+chain = Record(Record({'key': [Record('deep')]}))
+
+cases = [
+    Case('literal-heavy', (paragraph + '{{escaped}} ') * 10 + '{}', ('end',), {}),
+    Case('field-heavy', ' '.join('{%d}' % (i % 10) for i in range(50)), tuple(range(10)), {}),
+    Case('keyword fields', '{a} {b} {c} {a} {b} {c} {d}', (), {'a': 1, 'b': 'two', 'c': 3.0, 'd': None}),
+    Case('static spec', '{:>10} {:8.3f} {:,} {:+d} {!r:^12}', ('eggs', 3.14159, 1234567, 42, 'ham'), {}),
+    Case('nested spec', '{:{}>{}} {:.{}f}', ('eggs', '*', 10, 2.5, 3), {}),
+    Case('attribute/index chain', '{0.x.x[key][0].x} {0.x.y} {1[2]}', (chain, [1, 2, 3]), {}),
+    Case('large', ('row {} of the report: {name} scored {score:6.2f}\n' * 200).replace('{}', '{0}'),
+         (7,), {'name': 'bob', 'score': 98.25}),
+]
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def measure(case, repeat):
+    template = compile_(case.format_str)
+    function = template.compile()
+    expected = case.format_str.format(*case.args, **case.kwargs)
+    assert template.format(*case.args, **case.kwargs) == expected, case.name
+    assert function(*case.args, **case.kwargs) == expected, case.name
+
+    builtin = ns_per_op(lambda: case.format_str.format(*case.args, **case.kwargs), repeat=repeat)
+    compile_time = ns_per_op(lambda: compile_(case.format_str), repeat=repeat)
+    render = ns_per_op(lambda: template.format(*case.args, **case.kwargs), repeat=repeat)
+    compiled = ns_per_op(lambda: function(*case.args, **case.kwargs), repeat=repeat)
+    # everything is stored relative to str.format on the same machine, so a baseline
+    # recorded on one machine is still meaningful on another
+    return {'str.format ns': builtin,
+            'compile': compile_time / builtin,
+            'render': render / builtin,
+            'compiled render': compiled / builtin}
+
+
+def compare(results, baseline, threshold):
+    """
+    returns a message for every metric that got more than threshold (a fraction) slower than baseline
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            if metric.endswith(' ns') or metric not in baseline.get(name, {}):
+                continue
+            previous = baseline[name][metric]
+            if value > previous * (1 + threshold):
+                regressions.append('{} {}: {:.2f}x str.format, baseline {:.2f}x (+{:.0%})'.format(
+                    name, metric, value, previous, value / previous - 1))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='compare format_ with str.format across template classes')
+    parser.add_argument('--baseline', default=default_baseline, help='baseline JSON file (default: %(default)s)')
+    parser.add_argument('--save', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='fail when a metric is this fraction slower than the baseline (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='timing runs per measurement (default: %(default)s)')
+    parser.add_argument('--only', action='append', help='only run the named template class (repeatable)')
+    options = parser.parse_args(argv)
+
+    results = {case.name: measure(case, options.repeat)
+               for case in cases if not options.only or case.name in options.only}
+    report([(name, '{:.0f}'.format(metrics['str.format ns']), '{:.1f}x'.format(metrics['compile']),
+             '{:.2f}x'.format(metrics['render']), '{:.2f}x'.format(metrics['compiled render']))
+            for name, metrics in results.items()],
+           ('template', 'str.format ns/op', 'compile', 'render', 'compiled render'))
+
+    if options.save:
+        with open(options.baseline, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print('saved baseline to {}'.format(options.baseline))
+        return 0
+
+    if not os.path.exists(options.baseline):
+        print('no baseline at {}, run with --save to create one'.format(options.baseline))
+        return 0
+    with open(options.baseline) as file:
+        regressions = compare(results, json.load(file), options.threshold)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,22 @@
+from timeit import Timer
+
+
+def ns_per_op(function, number=None, repeat=5):
+    """
+    returns the best time of repeat runs of function in nanoseconds per call.
+    If number is None it is picked so that one run takes at least 0.2 seconds.
+    """
+    timer = Timer(function)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+def report(rows, headers):
+    """
+    prints rows (a list of tuples) as a left-aligned table
+    """
+    rows = [tuple(str(cell) for cell in row) for row in rows]
+    widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+    for row in [tuple(headers)] + rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
\ No newline at end of file
@@ -0,0 +1,5 @@
+import sys
+
+from .Suite import main
+
+sys.exit(main())
\ No newline at end of file
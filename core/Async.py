@@ -0,0 +1,49 @@
+import asyncio
+from inspect import isawaitable
+from typing import Mapping, Sequence
+
+from .Node import FormatString
+
+
+async def gather(awaitables, limit=None):
+    """
+    awaits every awaitable concurrently, at most limit at a time if limit is given, and
+    returns their results in order. If one fails the others are cancelled.
+    """
+    semaphore = asyncio.Semaphore(limit) if limit else None
+
+    async def wait(awaitable):
+        if semaphore is None:
+            return await awaitable
+        async with semaphore:
+            return await awaitable
+
+    tasks = [asyncio.ensure_future(wait(awaitable)) for awaitable in awaitables]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+async def render_async(format_string: FormatString, args: Sequence = (), kwargs: Mapping = None, limit=None):
+    """
+    formats format_string like FormatString.format, except that arguments it refers to
+    may be awaitables (coroutines, tasks, futures). Those are awaited concurrently, so
+    the wait is as long as the slowest of them rather than all of them added up, and
+    then the template is rendered with their results. limit caps how many are awaited
+    at once. An awaitable passed for several arguments is only awaited once; arguments
+    the template does not refer to are passed through untouched.
+    """
+    args = list(args)
+    kwargs = dict(kwargs or {})
+    slots = [(args, index) for index in format_string.positional if index < len(args) and isawaitable(args[index])]
+    slots += [(kwargs, key) for key in format_string.keywords if key in kwargs and isawaitable(kwargs[key])]
+
+    if slots:
+        awaitables = {id(container[key]): container[key] for container, key in slots}
+        results = dict(zip(awaitables, await gather(awaitables.values(), limit)))
+        for container, key in slots:
+            container[key] = results[id(container[key])]
+    return format_string.format(*args, **kwargs)
\ No newline at end of file
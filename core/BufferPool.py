@@ -0,0 +1,50 @@
+from contextlib import contextmanager
+from threading import Lock
+
+
+class BufferPool:
+    """
+    keeps up to size empty bytearrays for render_bytes to reuse, so that rendering
+    message after message does not allocate a new buffer each time. Buffers that grew
+    past max_capacity are not kept, so one huge message does not pin its memory.
+    """
+    def __init__(self, size=16, max_capacity=1 << 20):
+        self.size = size
+        self.max_capacity = max_capacity
+        self.lock = Lock()
+        self.buffers = []
+
+    def acquire(self) -> bytearray:
+        with self.lock:
+            if self.buffers:
+                return self.buffers.pop()
+        return bytearray()
+
+    def release(self, buffer: bytearray):
+        """
+        returns buffer to the pool. Every memoryview of it must have been released first,
+        otherwise it cannot be emptied and is dropped instead.
+        """
+        if len(buffer) > self.max_capacity:
+            return
+        try:
+            del buffer[:]
+        except BufferError:
+            return
+        with self.lock:
+            if len(self.buffers) < self.size:
+                self.buffers.append(buffer)
+
+    @contextmanager
+    def buffer(self):
+        """
+        lends out a buffer for the duration of the with block
+        """
+        buffer = self.acquire()
+        try:
+            yield buffer
+        finally:
+            self.release(buffer)
+
+    def __len__(self):
+        return len(self.buffers)
\ No newline at end of file
@@ -0,0 +1,156 @@
+import mmap
+import os
+import pickle
+import struct
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from typing import Iterable
+
+from .Node import FormatString
+
+# bump whenever the pickled form of the nodes changes, so stale bundles are ignored
+FORMAT_VERSION = 2
+MAGIC = b'FMTBNDL\0'
+header_size = struct.Struct('<8sQ')
+# what unpickling a truncated or corrupt blob, or one pickled from classes that have
+# changed shape since without a FORMAT_VERSION bump, can raise
+unpickling_errors = (pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError)
+
+
+class BundleException(Exception):
+    pass
+
+
+def template_key(format_str):
+    return sha256(format_str.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+def write_bundle(path, format_strs: Iterable[str], compile_):
+    """
+    compiles every format string with compile_ and writes the FormatStrings to path.
+    The file is a fixed header, a pickled index of template key -> (offset, length)
+    and then one pickled (format_str, FormatString) blob per template, so a reader
+    only has to unpickle the templates it actually uses.
+    The file is written next to path and renamed over it, so readers never see a partial bundle.
+    """
+    blobs = []
+    entries = {}
+    offset = 0
+    for format_str in dict.fromkeys(format_strs):
+        blob = pickle.dumps((format_str, compile_(format_str)), pickle.HIGHEST_PROTOCOL)
+        entries[template_key(format_str)] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+    index = pickle.dumps({'version': FORMAT_VERSION, 'entries': entries}, pickle.HIGHEST_PROTOCOL)
+
+    temporary = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temporary, 'wb') as file:
+        file.write(header_size.pack(MAGIC, len(index)))
+        file.write(index)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temporary, path)
+    return len(entries)
+
+
+class TemplateBundle:
+    """
+    read side of write_bundle. The file is memory-mapped and only its index is read up
+    front; each template is unpickled the first time it is asked for. If the file's
+    mtime or size changes (checked at most every check_interval seconds) the bundle is
+    reopened. A bundle written by an incompatible FORMAT_VERSION is treated as empty,
+    so every lookup misses and callers fall back to compiling, and so is a bundle whose
+    file disappears or stops being a valid bundle after it was opened. A template whose
+    blob cannot be unpickled is missed the same way.
+    """
+    def __init__(self, path, check_interval=1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.lock = Lock()
+        self.file = None
+        self.map = None
+        self.stat = None
+        self.checked = None
+        self.entries = {}
+        self.templates = {}
+        self.open()
+
+    def open(self):
+        stat = os.stat(self.path)
+        file = open(self.path, 'rb')
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b''
+            if len(data) < header_size.size:
+                raise BundleException('{} is too short to be a template bundle'.format(self.path))
+            magic, index_length = header_size.unpack_from(data)
+            if magic != MAGIC:
+                raise BundleException('{} is not a template bundle'.format(self.path))
+            try:
+                index = pickle.loads(data[header_size.size:header_size.size + index_length])
+                version, entries = index['version'], index['entries']
+            except Exception as error:
+                raise BundleException('{} has a corrupt index'.format(self.path)) from error
+        except BaseException:
+            file.close()
+            raise
+
+        self.close()
+        self.file, self.map, self.stat = file, data, (stat.st_mtime_ns, stat.st_size)
+        self.base = header_size.size + index_length
+        self.entries = entries if version == FORMAT_VERSION else {}
+        self.templates = {}
+        self.checked = monotonic()
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        if self.file is not None:
+            self.file.close()
+        self.file = self.map = None
+
+    def refresh(self):
+        """
+        reopens the bundle if the file changed on disk since it was opened. If the file is
+        gone or unreadable the bundle is dropped until a later refresh finds a good one.
+        """
+        self.checked = monotonic()
+        try:
+            stat = os.stat(self.path)
+            if (stat.st_mtime_ns, stat.st_size) != self.stat:
+                self.open()
+        except (OSError, BundleException):
+            self.close()
+            self.stat = None
+            self.entries = {}
+            self.templates = {}
+
+    def get(self, format_str) -> FormatString:
+        """
+        returns the precompiled FormatString for format_str, or None if the bundle does not have it
+        """
+        with self.lock:
+            if monotonic() - self.checked >= self.check_interval:
+                self.refresh()
+            template = self.templates.get(format_str)
+            if template is not None:
+                return template
+            entry = self.entries.get(template_key(format_str))
+            if entry is None:
+                return None
+            offset, length = entry
+            start = self.base + offset
+            try:
+                stored_str, template = pickle.loads(self.map[start:start + length])
+            except unpickling_errors:
+                return None
+            if stored_str != format_str or not isinstance(template, FormatString):
+                return None
+            self.templates[format_str] = template
+            return template
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, format_str):
+        return template_key(format_str) in self.entries
\ No newline at end of file
@@ -0,0 +1,139 @@
+from typing import Mapping, Sequence, Union
+
+from .Node import FormatString, FormatSpec, Literal, Type
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# NumPy dtypes whose tolist() values format like the array's own scalars, with the type they become
+exact_dtypes = {numpy.dtype(numpy.int64): int, numpy.dtype(numpy.float64): float} if numpy is not None else {}
+
+# printf conversions that give the same output as format() for the types listed
+printf_types = {'d': (int,), 'x': (int,), 'X': (int,), 'o': (int,),
+                'f': (int, float), 'F': (int, float), 'e': (int, float), 'E': (int, float)}
+
+
+def printf_spec(spec: FormatSpec):
+    """
+    translates a parsed FormatSpec into an equivalent printf-style conversion
+    and the types it is valid for, or returns None if there is no exact equivalent
+    """
+    if not spec.valid or spec.alternate or spec.grouping:
+        return None
+    format_type = spec.type or Type.decimal
+    if format_type not in printf_types or (format_type in 'dxXo' and spec.precision is not None):
+        return None
+
+    flags = ''
+    if spec.align:
+        if spec.zero or spec.fill not in (None, ' ') or spec.align not in '<>':
+            return None
+        if spec.align == '<':
+            flags += '-'
+    if spec.sign in ('+', ' '):
+        flags += spec.sign
+    if spec.zero:
+        flags += '0'
+    width = '' if spec.width is None else str(spec.width)
+    precision = '' if spec.precision is None else '.' + str(spec.precision)
+    types = (int,) if spec.type is None else printf_types[format_type]
+    return '%' + flags + width + precision + format_type, types
+
+
+def column_values(column):
+    """
+    returns the column as a list of python objects and the single type shared by all of them,
+    or None for that type if the column is mixed (or bool, which formats differently from int).
+    Only arrays whose elements tolist() turns into objects that format exactly the same are
+    converted in one go: a float32 would become a float that prints all of its binary digits,
+    so other dtypes keep their NumPy scalars (or, for object arrays, the objects themselves).
+    """
+    if numpy is not None and isinstance(column, numpy.ndarray) and column.dtype in exact_dtypes:
+        return column.tolist(), exact_dtypes[column.dtype]
+    values = list(column)
+    types = set(map(type, values))
+    return values, types.pop() if len(types) == 1 else None
+
+
+def printf_column(conversion, values):
+    """
+    formats every value with one %-operation on a joined format string instead of one
+    __format__ call per value. Numbers never contain NUL, so it can separate the results.
+    """
+    if not values:
+        return []
+    return ('\0'.join([conversion] * len(values)) % tuple(values)).split('\0')
+
+
+def format_column(replacement, columns):
+    """
+    formats one replacement field for every row at once, or returns None if its spec
+    refers to other fields and so has to be formatted row by row
+    """
+    if replacement.format_spec.inners:
+        return None
+
+    field_name = replacement.field_name
+    column = columns[field_name.argument]
+
+    if field_name.get is not None or replacement.conversion.char:
+        # the original elements, since e.g. the repr of a NumPy scalar is not that of its tolist() value
+        values = list(column)
+        if field_name.get is not None:
+            values = list(map(field_name.get, values))
+        values = [replacement.conversion.eval(value) for value in values]
+        value_type = None
+    else:
+        values, value_type = column_values(column)
+
+    printf = printf_spec(replacement.format_spec)
+    if printf is not None and value_type in printf[1]:
+        return printf_column(printf[0], values)
+    format_spec = replacement.format_spec.format
+    return [format_spec(value) for value in values]
+
+
+def row_arguments(columns, rows):
+    """
+    yields the args and kwargs of every row, for fields that cannot be formatted by column
+    """
+    count = max([key + 1 for key in columns if isinstance(key, int)], default=0)
+    for index in range(count):
+        if index not in columns:
+            raise IndexError('Replacement index %d out of range for positional args tuple' % index)
+    keywords = [key for key in columns if not isinstance(key, int)]
+    for row in range(rows):
+        yield [columns[index][row] for index in range(count)], {key: columns[key][row] for key in keywords}
+
+
+def format_columns(format_string: FormatString, columns: Mapping[Union[int, str], Sequence]):
+    """
+    formats format_string once for every row of columns, which maps each argument
+    (an index for positional fields, a name for keyword fields) to a sequence or
+    NumPy array holding that argument's value for every row. Fields whose spec has
+    an exact printf equivalent are formatted a column at a time; everything else
+    falls back to format() per value. Returns the list of formatted rows.
+    """
+    lengths = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError('columns have different lengths: {}'.format(sorted(lengths)))
+    rows = lengths.pop() if lengths else 0
+    for index in format_string.positional:
+        if index not in columns:
+            raise IndexError('Replacement index %d out of range for positional args tuple' % index)
+
+    parts = []
+    for node in format_string.nodes:
+        if isinstance(node, Literal):
+            parts.append([node.text] * rows)
+            continue
+        column = format_column(node, columns)
+        if column is None:
+            column = [node.eval(*args, **kwargs) for args, kwargs in row_arguments(columns, rows)]
+        parts.append(column)
+
+    if not parts:
+        return [''] * rows
+    return [''.join(row) for row in zip(*parts)]
\ No newline at end of file
@@ -0,0 +1,101 @@
+import unicodedata
+from keyword import iskeyword
+
+
+class Compiler:
+    """
+    turns the Python expressions produced by Node.compile into a single
+    render(*args, **kwargs) function. Values that cannot be written as
+    source literals are stored in the function's globals by constant().
+    Fields in shared (a set of ids of FieldNames used more than once) are looked
+    up the first time they are needed and kept in a local after that, see share().
+    If hoisting, fields assign their parts to locals in statements before the return
+    (see assign()), so that no expression is nested as deeply as the template.
+    """
+    def __init__(self, name='render', shared=(), hoisting=False):
+        self.name = name
+        self.namespace = {}
+        self.shared = shared
+        self.locals = {}
+        self.hoisting = hoisting
+        self.statements = []
+
+    @staticmethod
+    def is_attribute_name(name):
+        """
+        whether value.name in generated source looks up exactly name. Python NFKC-normalizes
+        identifiers in source, so names like 'ﬁ' or 'ℌ' would look up something else.
+        """
+        return (isinstance(name, str) and name.isidentifier() and not iskeyword(name)
+                and unicodedata.normalize('NFKC', name) == name)
+
+    def constant(self, value):
+        name = '_c{}'.format(len(self.namespace))
+        self.namespace[name] = value
+        return name
+
+    def share(self, field_name, expression):
+        """
+        returns expression, or if field_name is shared an expression that evaluates it
+        only where the field is first used and reads the saved value everywhere else
+        """
+        key = id(field_name)
+        if key not in self.shared:
+            return expression
+        name = self.locals.get(key)
+        if name is not None:
+            return name
+        name = self.locals[key] = '_f{}'.format(len(self.locals))
+        return '({} := {})'.format(name, expression)
+
+    def assign(self, expression):
+        """
+        adds a statement that evaluates expression into a new local and returns the local's
+        name. Statements run in the order they were added, before the returned expression.
+        """
+        name = '_h{}'.format(len(self.statements))
+        self.statements.append('{} = {}'.format(name, expression))
+        return name
+
+    def source(self, expressions):
+        if not expressions:
+            body = "''"
+        elif len(expressions) == 1:
+            body = expressions[0]
+        else:
+            body = "''.join(({},))".format(', '.join(expressions))
+        statements = ''.join(['    {}\n'.format(statement) for statement in self.statements])
+        return 'def {}(*args, **kwargs):\n{}    return {}\n'.format(self.name, statements, body)
+
+    def bytes_source(self, runs, encoding):
+        """
+        runs are either the name of a constant holding pre-encoded bytes or a list of
+        expressions whose str results are joined and encoded together
+        """
+        lines = ['        {}'.format(statement) for statement in self.statements]
+        for run in runs:
+            if isinstance(run, str):
+                lines.append('        buffer += {}'.format(run))
+            else:
+                text = run[0] if len(run) == 1 else "''.join(({},))".format(', '.join(run))
+                lines.append('        buffer += {}.encode({!r})'.format(text, encoding))
+        return ('def {}(buffer, /, *args, **kwargs):\n'
+                '    start = len(buffer)\n'
+                '    try:\n'
+                '{}\n'
+                '    except BaseException:\n'
+                '        del buffer[start:]\n'
+                '        raise\n'
+                '    return memoryview(buffer)[start:] if start else memoryview(buffer)\n').format(self.name, '\n'.join(lines or ['        pass']))
+
+    def compile_bytes(self, runs, encoding='utf-8'):
+        return self.compile_source(self.bytes_source(runs, encoding))
+
+    def compile(self, expressions):
+        return self.compile_source(self.source(expressions))
+
+    def compile_source(self, source):
+        exec(compile(source, '<formatter>', 'exec'), self.namespace)
+        function = self.namespace[self.name]
+        function.source = source
+        return function
\ No newline at end of file
@@ -0,0 +1,82 @@
+from threading import Lock
+
+from ..utils import CacheInfo
+
+# the exact types whose formatted output depends only on their value and the spec.
+# float is left out because equal floats can format differently (0.0 and -0.0), and
+# the key has the type in it because equal values of different types do too (1 and True).
+cacheable = frozenset([int, str, bool])
+# ints at least this large (either way) are formatted but not stored: they rarely repeat,
+# and each would pin a big key and string in the cache
+int_limit = 2 ** 31
+
+# the cache FormatSpec uses, or None while caching is off (the default)
+cache = None
+
+
+class FormatCache:
+    """
+    bounded cache of value.__format__(spec) for the types in cacheable.
+    A hit is a single dict lookup without taking a lock, since anything more costs about
+    as much as formatting a small int again, so there is no recency to track and eviction
+    is first in, first out: when the cache is full the entry stored longest ago is
+    evicted, however often it is hit. Strings longer than max_length and ints outside
+    (-int_limit, int_limit) are formatted but not stored. Hits are counted without the
+    lock, so with many threads the count is approximate.
+    """
+    def __init__(self, maxsize=4096, max_length=64):
+        if maxsize < 1:
+            raise ValueError('maxsize must be >= 1, not {}'.format(maxsize))
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.entries = {}
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def format(self, value, spec):
+        key = (type(value), value, spec)
+        result = self.entries.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        result = value.__format__(spec)
+        with self.lock:
+            self.misses += 1
+            storable = len(value) <= self.max_length if type(value) is str else -int_limit < value < int_limit
+            if storable and key not in self.entries:
+                if len(self.entries) >= self.maxsize:
+                    del self.entries[next(iter(self.entries))]
+                    self.evictions += 1
+                self.entries[key] = result
+        return result
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+
+def format_cached(value, spec):
+    """
+    format(value, spec), through the cache if there is one and value's type is cacheable
+    """
+    if cache is not None and type(value) in cacheable:
+        return cache.format(value, spec)
+    return format(value, spec)
+
+
+def enable(maxsize=4096, max_length=64):
+    global cache
+    cache = FormatCache(maxsize, max_length)
+    return cache
+
+
+def disable():
+    global cache
+    cache = None
\ No newline at end of file
@@ -1,12 +1,155 @@
+from . import Bundle, Columnar, FormatCache, Instrumentation, Parallel
 from .Lexer import Lexer
 
 from .Parser import Parser
+from ..utils import LRUCache
 
+template_cache = LRUCache(maxsize=1024)
+# functions from FormatString.compile_bytes, for render_bytes
+bytes_renderers = LRUCache(maxsize=1024)
+# precompiled templates consulted before compiling, see load_bundle
+bundle = None
 
-def format_(format_str, *args, **kwargs):
+
+def compile_(format_str):
+    """
+    lexes and parses format_str into a FormatString without consulting the cache
+    """
+    observer = Instrumentation.active.get()
+    if observer is not None:
+        return Instrumentation.compile_(observer, format_str)
     lexer = Lexer(format_str)
-    tokens = lexer.tokens
+    tokens = lexer.token_stream
     parser = Parser(tokens)
     parser.parse()
-    format_string = parser.format_string
-    return format_string.format(*args, **kwargs)
+    return parser.format_string
+
+
+def get_template(format_str):
+    """
+    returns the compiled FormatString for format_str, compiling it only
+    the first time it is seen (or after it has been evicted)
+    """
+    return template_cache.get(format_str, load_or_compile)
+
+
+def load_or_compile(format_str):
+    template = bundle.get(format_str) if bundle is not None else None
+    return template if template is not None else compile_(format_str)
+
+
+def save_bundle(path, format_strs):
+    """
+    precompiles format_strs into a bundle file that load_bundle can read at startup
+    """
+    return Bundle.write_bundle(path, format_strs, compile_)
+
+
+def load_bundle(path, check_interval=1.0):
+    """
+    makes get_template (and so format_ and friends) take templates from the bundle at
+    path instead of compiling them. Templates missing from the bundle are still compiled.
+    Passing None unloads the current bundle.
+    """
+    global bundle
+    if bundle is not None:
+        bundle.close()
+    bundle = Bundle.TemplateBundle(path, check_interval) if path is not None else None
+    cache_clear()
+    return bundle
+
+
+def format_(format_str, *args, **kwargs):
+    observer = Instrumentation.active.get()
+    if observer is not None:
+        return Instrumentation.render(observer, get_template(format_str), format_str, args, kwargs)
+    return get_template(format_str).format(*args, **kwargs)
+
+
+async def render_async(format_str, args=(), kwargs=None, limit=None):
+    """
+    format_, except that arguments may be awaitables, which are awaited concurrently
+    (at most limit at a time) before rendering
+    """
+    return await get_template(format_str).render_async(args, kwargs, limit)
+
+
+def format_lazy(format_str, *args, **kwargs):
+    """
+    format_, except that callable arguments are only called if format_str refers to them
+    """
+    return get_template(format_str).format_lazy(*args, **kwargs)
+
+
+def compile_bytes(format_str):
+    return get_template(format_str).compile_bytes()
+
+
+def render_bytes(format_str, buffer, /, *args, **kwargs):
+    """
+    appends format_(format_str, *args, **kwargs).encode() to the bytearray buffer without
+    building the str first, and returns a memoryview of the appended bytes, which must be
+    released before buffer is changed again. See FormatString.compile_bytes.
+    """
+    return bytes_renderers.get(format_str, compile_bytes)(buffer, *args, **kwargs)
+
+
+def format_many(format_str, rows):
+    return get_template(format_str).format_many(rows)
+
+
+def render_iter(format_str, *args, **kwargs):
+    return get_template(format_str).render_iter(*args, **kwargs)
+
+
+def render_into(format_str, writer, *args, **kwargs):
+    get_template(format_str).render_into(writer, *args, **kwargs)
+
+
+def render_many_into(format_str, writer, rows):
+    get_template(format_str).render_many_into(writer, rows)
+
+
+def format_columns(format_str, columns):
+    return Columnar.format_columns(get_template(format_str), columns)
+
+
+def render_parallel(template, rows, workers=4, chunksize=None):
+    """
+    template is either a format string or an already compiled FormatString
+    """
+    if isinstance(template, str):
+        template = get_template(template)
+    return Parallel.render_parallel(template, rows, workers, chunksize)
+
+
+def enable_format_cache(maxsize=4096, max_length=64):
+    """
+    remembers the result of formatting ints below 2 ** 31 in magnitude, bools and strings
+    of up to max_length characters with a spec, for up to maxsize (type, value, spec)
+    combinations, evicting the one stored first when full.
+    Functions from FormatString.compile only use it if it was on when they were compiled.
+    """
+    return FormatCache.enable(maxsize, max_length)
+
+
+def disable_format_cache():
+    FormatCache.disable()
+
+
+def format_cache_info():
+    return FormatCache.cache.info() if FormatCache.cache is not None else None
+
+
+def cache_info():
+    return template_cache.info()
+
+
+def cache_clear():
+    template_cache.clear()
+    bytes_renderers.clear()
+
+
+def set_cache_size(maxsize):
+    template_cache.resize(maxsize)
+    bytes_renderers.resize(maxsize)
\ No newline at end of file
@@ -0,0 +1,139 @@
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+
+from .Lexer import Lexer
+from .Node import Replacement
+from .Parser import Parser
+from .Scanner import Scanner
+
+# the observer that Formatter reports to, or None when instrumentation is off. It is a
+# context variable, so each thread and asyncio task sees only the observer its own
+# instrument() block set. Formatter reads it once per call, so disabled instrumentation
+# costs a single lookup and nothing is timed or counted.
+active = ContextVar('observer', default=None)
+
+
+class Observer:
+    """
+    collects timings per phase (lex, parse, render, and inside render field, conversion
+    and format_spec, which overlap render), counts of every node type rendered, and the
+    total time spent on each template.
+    """
+    def __init__(self):
+        self.lock = Lock()
+        self.phases = defaultdict(lambda: [0, 0.0, 0.0])  # calls, total seconds, slowest call
+        self.nodes = Counter()
+        self.templates = Counter()
+
+    def record(self, phase, seconds, format_str=None):
+        with self.lock:
+            stats = self.phases[phase]
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+            if format_str is not None:
+                self.templates[format_str] += seconds
+
+    def count(self, node_type, count=1):
+        with self.lock:
+            self.nodes[node_type] += count
+
+    @contextmanager
+    def phase(self, name, format_str=None):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start, format_str)
+
+    def slowest(self, count=10):
+        """
+        returns the count templates that took the most lex + parse + render time, with their seconds
+        """
+        with self.lock:
+            return self.templates.most_common(count)
+
+    def stats(self):
+        """
+        returns everything recorded so far as plain dicts, ready for json.dumps
+        """
+        with self.lock:
+            return {'phases': {name: {'calls': calls, 'total': total, 'mean': total / calls, 'max': slowest}
+                               for name, (calls, total, slowest) in self.phases.items()},
+                    'nodes': dict(self.nodes)}
+
+    def reset(self):
+        with self.lock:
+            self.phases.clear()
+            self.nodes.clear()
+            self.templates.clear()
+
+
+@contextmanager
+def instrument(new_observer=None):
+    """
+    reports to new_observer (or a fresh Observer) for the duration of the with block
+    and yields it. The previous observer is restored afterwards. Only calls made in the
+    same thread or asyncio task are recorded (tasks created inside the block inherit it,
+    new threads do not).
+    Only format_ and compile_ are instrumented, along with whatever compiles through
+    compile_ (so a template that format_many, render_iter and the like compile for the
+    first time has its lex and parse recorded). Their rendering, and that of
+    render_parallel, render_bytes and the functions from FormatString.compile, is not.
+    """
+    observer = new_observer if new_observer is not None else Observer()
+    token = active.set(observer)
+    try:
+        yield observer
+    finally:
+        active.reset(token)
+
+
+def compile_(active, format_str):
+    """
+    Formatter.compile_, but lexing everything before parsing so the two phases can be timed apart
+    """
+    with active.phase('lex', format_str):
+        tokens = Scanner(list(Lexer(format_str).lex()))
+    with active.phase('parse', format_str):
+        return Parser(tokens).parse()
+
+
+def render(active, format_string, format_str, args, kwargs):
+    """
+    FormatString.format, timing each part of every replacement field
+    """
+    with active.phase('render', format_str):
+        return ''.join([render_node(active, node, args, kwargs) for node in format_string.nodes])
+
+
+def count_replacement(active, replacement):
+    replacements = [replacement]
+    while replacements:
+        replacement = replacements.pop()
+        active.count(type(replacement).__name__)
+        active.count(type(replacement.field_name).__name__)
+        for getter in replacement.field_name.getters:
+            active.count(type(getter).__name__)
+        if replacement.conversion.char:
+            active.count(type(replacement.conversion).__name__)
+        if replacement.format_spec.format_str:
+            active.count(type(replacement.format_spec).__name__)
+        replacements.extend(replacement.format_spec.inners)
+
+
+def render_node(active, node, args, kwargs):
+    if not isinstance(node, Replacement):
+        active.count(type(node).__name__)
+        return node.eval(*args, **kwargs)
+
+    count_replacement(active, node)
+    with active.phase('field'):
+        value = node.field_name.eval(*args, **kwargs)
+    with active.phase('conversion'):
+        value = node.conversion.eval(value)
+    with active.phase('format_spec'):
+        return node.format_spec.format(value, *args, **kwargs)
\ No newline at end of file
@@ -1,8 +1,10 @@
-from string import digits, whitespace, punctuation, printable, octdigits, hexdigits
+import re
+from string import digits, whitespace, punctuation, octdigits, hexdigits
 
 from .Node import Replacement, Conversion, FormatSpec, Attribute, Index
 from .Scanner import Scanner
 from .Token import Token
+from .TokenStream import TokenStream
 
 from .TokenEnum import TokenEnum
 
@@ -11,23 +13,60 @@ class LexerException(Exception):
     pass
 
 
+def char_class(chars, negate=False):
+    return '[{}{}]'.format('^' if negate else '', ''.join(re.escape(char) for char in sorted(chars)))
+
+
+def classify(char):
+    """
+    returns the type of token char starts: identifiers start with whatever str.isidentifier
+    accepts as a first character, in any script, and everything that is not a brace,
+    an ASCII digit or an identifier start (whitespace included) is punctuation
+    """
+    if char in '{}':
+        return TokenEnum.delimiter
+    if char in digits:
+        return TokenEnum.integer
+    if char.isidentifier():
+        return TokenEnum.id
+    return TokenEnum.punctuation
+
+
 class Lexer:
     delimiter = set('{}')
     punctuation = set(punctuation) - delimiter - set('_')
-    literal = set(printable) - delimiter
     integer = set(digits)
-    id_ = set(printable) - (punctuation | delimiter | set(whitespace))
-    id_start = id_ - integer
+
+    # classify for every character seen so far, filled in up front for ASCII
+    types = {chr(code): classify(chr(code)) for code in range(128)}
+    # whether a character can continue an identifier, for the characters that could not be decided in bulk
+    continues = {}
+
+    # literals run until the next brace, whatever script they are in
+    literal_end = re.compile('[{}]')
+    # the longest run that can possibly be an identifier: everything up to ASCII punctuation or
+    # whitespace. Almost always the run is the identifier, which one isidentifier call confirms.
+    id_rest = re.compile(char_class(punctuation | delimiter | set(whitespace), negate=True) + '*')
+    binary_digits = re.compile('[01]*')
+    octal_digits = re.compile(char_class(octdigits) + '*')
+    hex_digits = re.compile(char_class(hexdigits) + '*')
+    decimal_digits = re.compile('[0-9]*')
+    zeroes = re.compile('0*')
+    index_string = re.compile('[^]]*')
 
     @staticmethod
     def get_type(char):
-        types = [(Lexer.id_start, TokenEnum.id),
-                 (Lexer.integer, TokenEnum.integer),
-                 (Lexer.punctuation, TokenEnum.punctuation),
-                 (Lexer.delimiter, TokenEnum.delimiter)]
-        for char_set, token_type in types:
-            if char in char_set:
-                return token_type
+        token_type = Lexer.types.get(char)
+        if token_type is None:
+            token_type = Lexer.types[char] = classify(char)
+        return token_type
+
+    @staticmethod
+    def continues_identifier(char):
+        result = Lexer.continues.get(char)
+        if result is None:
+            result = Lexer.continues[char] = ('a' + char).isidentifier()
+        return result
 
     @staticmethod
     def make_token(string):
@@ -43,18 +82,36 @@ class Lexer:
         assert self.scanner.index == 0
 
     def get_literal(self):
-        i = 0
+        """
+        jumps from one non-literal character to the next with a single regex search
+        each instead of peeking at every character of the literal
+        """
+        pattern = self.scanner.tokens
+        start = i = self.scanner.index
         while True:
-            while self.scanner.peek(i) in Lexer.literal:
-                i += 1
-            curr = self.scanner.peek(i)
-            if curr is None:
-                return self.scanner.collect(i)
-            elif self.scanner.peek(i + 1) == curr:  # escaped brace
+            match = Lexer.literal_end.search(pattern, i)
+            if match is None:
+                return self.scanner.collect(len(pattern) - start)
+            i = match.start()
+            curr = pattern[i]
+            if pattern[i + 1:i + 2] == curr:  # escaped brace
                 i += 2
             else:
                 self.expect(curr != '}', "unmatched '}'")
-                return self.scanner.collect(i)
+                return self.scanner.collect(i - start)
+
+    def get_identifier(self):
+        """
+        assumes that the identifier's first character was just consumed
+        """
+        candidate = self.scanner.match(Lexer.id_rest, 1)
+        if candidate.isidentifier():
+            return candidate
+        end = 1
+        while end < len(candidate) and Lexer.continues_identifier(candidate[end]):
+            end += 1
+        self.scanner.backup(len(candidate) - end)
+        return candidate[:end]
 
     def lex_binary(self):
         """
@@ -63,7 +120,7 @@ class Lexer:
         if self.scanner.peek(1) not in 'Bb':
             return None
         self.scanner.consume(2)
-        return int(self.scanner.get_while(lambda char: char in '01'), 2)
+        return int(self.scanner.match(Lexer.binary_digits), 2)
 
     def lex_octal(self):
         """
@@ -72,7 +129,7 @@ class Lexer:
         if self.scanner.peek(1) not in 'Oo':
             return None
         self.scanner.consume(2)
-        return int(self.scanner.get_while(lambda char: char in octdigits), 8)
+        return int(self.scanner.match(Lexer.octal_digits), 8)
 
     def lex_hex(self):
         """
@@ -81,7 +138,7 @@ class Lexer:
         if self.scanner.peek(1) not in 'Xx':
             return None
         self.scanner.consume(2)
-        return int(self.scanner.get_while(lambda char: char in hexdigits), 16)
+        return int(self.scanner.match(Lexer.hex_digits), 16)
 
     def lex_int(self):
         if self.scanner.peek() == '0':
@@ -94,11 +151,11 @@ class Lexer:
                 elif number == '':
                     raise LexerException('expected {} string'.format(type))
             else:
-                zeroes = self.scanner.get_while(lambda char: char == '0')
+                zeroes = self.scanner.match(Lexer.zeroes)
                 Lexer.expect(self.scanner.peek() not in digits, 'invalid integer')
                 return Token(0, TokenEnum.integer)
         elif self.scanner.peek() in digits:
-            return Token(int(self.scanner.get_while(lambda char: char in digits)), TokenEnum.integer)
+            return Token(int(self.scanner.match(Lexer.decimal_digits)), TokenEnum.integer)
         else:
             return None
 
@@ -115,7 +172,7 @@ class Lexer:
         attribute_name::=  identifier
         element_index::=  integer | index_string
         index_string::= < any source character except "]" > +
-        conversion::=  "right" | "s" | "a"
+        conversion::=  "r" | "s" | "a"
         format_spec::= < described in the next section >
         """
         """
@@ -125,11 +182,14 @@ class Lexer:
         sign        ::=  "+" | "-" | " "
         width       ::=  integer
         precision   ::=  integer
-        type        ::=  "board" | "c" | "down" | "e" | "E" | "f" | "F" | "g" | "G" | "n" | "o" | "s" | "x" | "X" | "%"
+        type        ::=  "b" | "c" | "d" | "e" | "E" | "f" | "F" | "g" | "G" | "n" | "o" | "s" | "x" | "X" | "%"
         """
         if self.scanner:
             self.expect(self.scanner.consume() == '{', "unmatched '{'")
             yield Replacement.l_brace
+            # one entry per field that is still open, innermost last: whether its spec has started.
+            # Nested fields push onto this instead of recursing, so every token is yielded once.
+            in_spec = [False]
             curr = self.scanner.consume()
             while curr:
                 if curr == '[':
@@ -142,9 +202,7 @@ class Lexer:
                         if num_index:
                             yield num_index
                         else:
-                            yield Token(
-                                self.scanner.get_while(lambda char: char != ']'),
-                                TokenEnum.literal)
+                            yield Token(self.scanner.match(Lexer.index_string), TokenEnum.literal)
                         Lexer.expect(self.scanner.consume() == ']', "unmatched ']'")
                         yield Index.r_bracket
                 elif curr == '.':
@@ -152,19 +210,24 @@ class Lexer:
                 elif curr == '!':
                     yield Conversion.exclamation
                 elif curr == ':':
+                    in_spec[-1] = True
                     yield FormatSpec.colon
                 elif curr == '}':
                     yield Replacement.r_brace
-                    return
+                    in_spec.pop()
+                    if not in_spec:
+                        return
                 elif curr == '{':
-                    self.scanner.backup()
-                    for token in self.lex_replacement():
-                        yield token
+                    yield Replacement.l_brace
+                    in_spec.append(False)
+                elif curr in digits and in_spec[-1]:
+                    # keep the digits as written: '08' is a zero flag and a width, not an integer
+                    yield Token(self.scanner.match(Lexer.decimal_digits, 1), TokenEnum.literal)
                 elif curr in digits:
                     self.scanner.backup()
                     yield self.lex_int()
-                elif curr in Lexer.id_start:
-                    yield Lexer.make_token(self.scanner.get_while(lambda char: char in Lexer.id_, 1))
+                elif Lexer.get_type(curr) is TokenEnum.id:
+                    yield Token(self.get_identifier(), TokenEnum.id)
                 else:
                     yield Lexer.make_token(curr)
                 curr = self.scanner.consume()
@@ -175,8 +238,7 @@ class Lexer:
             literal = self.get_literal()
             if literal:
                 yield Token(literal, TokenEnum.literal)
-            for token in self.lex_replacement():
-                yield token
+            yield from self.lex_replacement()
 
     def __iter__(self):
         for token in self.lex():
@@ -186,3 +248,12 @@ class Lexer:
     def tokens(self):
         assert self.scanner.index == 0
         return Scanner(list(self.lex()))
+
+    @property
+    def token_stream(self):
+        """
+        like tokens, but lexes lazily as the parser asks for more tokens
+        instead of building the whole token list up front
+        """
+        assert self.scanner.index == 0
+        return TokenStream(self.lex())
@@ -0,0 +1,86 @@
+import mmap
+import os
+import re
+from typing import Mapping, Sequence
+
+from .Lexer import Lexer, LexerException
+from .Parser import Parser
+from ..utils import LRUCache
+
+braces = re.compile(rb'[{}]')
+
+
+def field_end(data, start):
+    """
+    returns the offset just past the '}' that closes the field opened at start, counting nested fields
+    """
+    depth = 0
+    for match in braces.finditer(data, start):
+        depth += 1 if data[match.start()] == ord('{') else -1
+        if depth == 0:
+            return match.end()
+    raise LexerException("unmatched '{'")
+
+
+def render_file(source, writer, args: Sequence = (), kwargs: Mapping = None, encoding='utf-8', chunk_size=1 << 20):
+    """
+    renders the format string in source, which is a path or an already open mmap (or any
+    other bytes-like object), into writer, which is a binary file-like object with a write
+    method or a callable such as list.append, and receives bytes in encoding.
+    The file is memory-mapped and searched for braces in place, literal text is copied to
+    writer chunk_size bytes at a time, and each field is parsed and rendered on its own,
+    so memory use depends on chunk_size and the largest field, not on the size of the file.
+    encoding must be ASCII compatible (UTF-8, Latin-1, ...) so that a brace byte is always a brace.
+    """
+    write = getattr(writer, 'write', writer)
+    if not isinstance(source, (str, os.PathLike)):
+        return render_buffer(source, write, args, kwargs or {}, encoding, chunk_size)
+    with open(source, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return None
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return render_buffer(data, write, args, kwargs or {}, encoding, chunk_size)
+
+
+def write_span(data, write, start, end, chunk_size):
+    for offset in range(start, end, chunk_size):
+        write(data[offset:min(end, offset + chunk_size)])
+
+
+def parse_field(field, automatic, automatic_index):
+    """
+    parses one field as if it came after fields that left numbering in the given state,
+    and returns the template and the numbering state after it
+    """
+    parser = Parser(Lexer(field).token_stream)
+    parser.automatic, parser.automatic_index = automatic, automatic_index
+    return parser.parse(), parser.automatic, parser.automatic_index
+
+
+def render_buffer(data, write, args, kwargs, encoding, chunk_size):
+    # automatic field numbering carries on from one field to the next, just as it
+    # would if the parser had seen the whole file
+    automatic, automatic_index = None, -1
+    # fixed layouts repeat the same fields, but there can be any number of distinct ones
+    fields = LRUCache(maxsize=256)
+    written = position = 0
+    while True:
+        match = braces.search(data, position)
+        if match is None:
+            break
+        start = match.start()
+        brace = data[start:start + 1]
+        if data[start + 1:start + 2] == brace:  # escaped brace
+            write_span(data, write, written, start + 1, chunk_size)
+            written = position = start + 2
+            continue
+        if brace == b'}':
+            raise LexerException("unmatched '}'")
+
+        write_span(data, write, written, start, chunk_size)
+        end = field_end(data, start)
+        key = data[start:end].decode(encoding), automatic, automatic_index
+        template, automatic, automatic_index = fields.get(key, lambda key: parse_field(*key))
+        write(template.format(*args, **kwargs).encode(encoding))
+        written = position = end
+    write_span(data, write, written, len(data), chunk_size)
\ No newline at end of file
@@ -1,32 +1,202 @@
-from typing import Sequence, Union
+import re
+from collections import Counter
+from operator import attrgetter, itemgetter
+from typing import Iterable, Mapping, Sequence, Union
 
+from . import FormatCache
+from .Compiler import Compiler
 from .Token import Token
 
-from ..utils import EqualityByValue
+from ..utils import ValueSlots, set_slot
 from .TokenEnum import TokenEnum
 
 
-@EqualityByValue
-class Node:
-    pass
+class Node(ValueSlots):
+    __slots__ = ()
 
 
-@EqualityByValue
 class FormatString(Node):
-    def __init__(self, nodes=None):
-        self.nodes = nodes or []
-
-    def append(self, node: Node):
-        self.nodes.append(node)
+    __slots__ = ('nodes', 'shared', 'constant', 'positional', 'keywords', 'compiled')
+    derived_slots = ('shared', 'constant', 'positional', 'keywords', 'compiled')
+    # literals at least this long are encoded once by compile_bytes; shorter ones are
+    # cheaper to encode along with the fields around them
+    pre_encode = 64
+
+    def __init__(self, nodes: Iterable[Node] = ()):
+        set_slot(self, 'nodes', tuple(nodes))
+        # the arguments the template refers to: indices in ascending order, and keywords in order of first use
+        arguments = [field_name.argument for field_name in self.field_names()]
+        set_slot(self, 'positional', tuple(sorted({argument for argument in arguments if type(argument) is int})))
+        set_slot(self, 'keywords',
+                 tuple(dict.fromkeys(argument for argument in arguments if type(argument) is not int)))
+        # the whole output if there are no replacement fields, so format can skip the tree walk
+        set_slot(self, 'constant', ''.join([node.text for node in self.nodes])
+                 if all(isinstance(node, Literal) for node in self.nodes) else None)
+        # ids of the FieldNames with getters that more than one field refers to. The parser
+        # hands out one FieldName per distinct path, so these are the repeated paths
+        # whose lookups are worth remembering for the rest of a render.
+        uses = Counter(id(field_name) for field_name in self.field_names() if field_name.get is not None)
+        set_slot(self, 'shared', frozenset(key for key, count in uses.items() if count > 1))
+        # (whether the format cache was on, compile()) once renderer has been asked for
+        set_slot(self, 'compiled', None)
+
+    def __reduce__(self):
+        return FormatString, (self.nodes,)
+
+    def field_names(self):
+        """
+        yields the FieldName of every field in order, including fields nested in specs
+        """
+        for node in self.nodes:
+            if isinstance(node, Replacement):
+                yield from node.field_names()
+
+    def paths(self):
+        """
+        returns every distinct field path the template looks up, as written in a format
+        string ('0', 'user.name', 'rows[0]'), in order of first use
+        """
+        return tuple(dict.fromkeys(field_name.path() for field_name in self.field_names()))
 
     def format(self, *args, **kwargs):
-        return ''.join(
-            node.eval(*args, **kwargs)
-            for node in self.nodes)
+        if self.constant is not None:
+            return self.constant
+        memo = {} if self.shared else None
+        return ''.join([node.render(args, kwargs, memo) for node in self.nodes])
+
+    async def render_async(self, args: Sequence = (), kwargs: Mapping = None, limit=None):
+        """
+        format, but awaiting the awaitable arguments concurrently first, see Async.render_async
+        """
+        from .Async import render_async
+        return await render_async(self, args, kwargs, limit)
+
+    def format_lazy(self, *args, **kwargs):
+        """
+        format, except that arguments that are callables are called with no arguments to
+        get their value, and only if the template refers to them, so expensive values the
+        template does not use are never computed. Each is called once however often it is
+        used. To format a callable itself, pass a callable returning it.
+        Keywords the template does not refer to are not passed on at all.
+        """
+        args = list(args)
+        for index in self.positional:
+            if index < len(args) and callable(args[index]):
+                args[index] = args[index]()
+        kwargs = {key: kwargs[key]() if callable(kwargs[key]) else kwargs[key]
+                  for key in self.keywords if key in kwargs}
+        return self.format(*args, **kwargs)
+
+    def fold(self, **constants):
+        """
+        returns a FormatString with every field that only refers to keywords in constants
+        already formatted into the surrounding text, for values that are known long before
+        the rest of the arguments. Those keywords no longer need to be passed to format.
+        """
+        return self.partial(**constants)
+
+    def partial(self, *args, **kwargs):
+        """
+        fold for positional arguments too: args are bound to the first positional fields
+        and the rest are renumbered, so format(*rest) on the result gives format(*args, *rest).
+        Raises ValueError if a bound field has a spec that refers to a field that is not bound.
+        """
+        from .Optimizer import optimize
+        return FormatString(optimize(self.nodes, kwargs, args))
+
+    def compile(self):
+        """
+        returns a function that takes the same arguments as format and gives the
+        same result, but with literals inlined and every field unrolled into
+        straight-line code instead of walking self.nodes
+        """
+        compiler = self.compiler()
+        return compiler.compile([node.compile(compiler) for node in self.nodes])
+
+    def compiler(self):
+        """
+        returns a Compiler for this template. Templates whose specs nest fields more than
+        one level deep get one statement per field (see Replacement.compile_statements),
+        since as one expression they would be as deep as the template, past what Python parses.
+        """
+        hoisting = any(isinstance(node, Replacement) and node.format_spec.nested for node in self.nodes)
+        return Compiler(shared=self.shared, hoisting=hoisting)
+
+    def renderer(self):
+        """
+        returns compile(), compiling only the first time and again if the format cache has
+        been turned on or off since, so batches of any size can use the compiled function
+        """
+        cached = FormatCache.cache is not None
+        compiled = self.compiled
+        if compiled is None or compiled[0] is not cached:
+            compiled = (cached, self.compile())
+            set_slot(self, 'compiled', compiled)
+        return compiled[1]
+
+    def compile_bytes(self, encoding='utf-8'):
+        """
+        returns a function render(buffer, *args, **kwargs) that appends format(*args, **kwargs)
+        encoded with encoding to the bytearray buffer and returns a memoryview of the bytes it
+        appended, without building the whole str first. Long literals are encoded here, once.
+        The memoryview must be released before buffer can be resized again. If rendering
+        fails, buffer is left as it was. Against compile()(...).encode() this only wins for
+        long non-ASCII literals; otherwise what it buys is writing into a reused buffer.
+        """
+        compiler = self.compiler()
+        runs = []
+        for node in self.nodes:
+            if isinstance(node, Literal) and len(node.text) >= FormatString.pre_encode:
+                runs.append(compiler.constant(node.text.encode(encoding)))
+                continue
+            if not runs or isinstance(runs[-1], str):
+                runs.append([])
+            runs[-1].append(node.compile(compiler))
+        return compiler.compile_bytes(runs, encoding)
+
+    def format_many(self, rows: Iterable[Union[Sequence, Mapping]]):
+        """
+        formats every row, where a row is either a sequence of positional arguments
+        or a mapping of keyword arguments. The template is compiled once, the first
+        time it renders a batch, so each row only pays for its own field lookups and formatting.
+        """
+        return list(self.render_many_iter(rows))
+
+    def render_iter(self, *args, **kwargs):
+        """
+        yields the result of format one node at a time, so the whole string
+        never has to be held in memory at once
+        """
+        memo = {} if self.shared else None
+        for node in self.nodes:
+            yield node.render(args, kwargs, memo)
+
+    def render_into(self, writer, *args, **kwargs):
+        """
+        writes the result of format chunk by chunk to writer, which is either
+        a file-like object with a write method or a callable such as list.append
+        """
+        write = getattr(writer, 'write', writer)
+        for chunk in self.render_iter(*args, **kwargs):
+            write(chunk)
+
+    def render_many_iter(self, rows: Iterable[Union[Sequence, Mapping]]):
+        """
+        lazy version of format_many that yields each formatted row as soon as
+        it is rendered
+        """
+        render = self.renderer()
+        for row in rows:
+            yield render(**row) if isinstance(row, Mapping) else render(*row)
+
+    def render_many_into(self, writer, rows: Iterable[Union[Sequence, Mapping]]):
+        write = getattr(writer, 'write', writer)
+        for chunk in self.render_many_iter(rows):
+            write(chunk)
 
 
-@EqualityByValue
 class Replacement(Node):
+    __slots__ = ('field_name', 'conversion', 'format_spec')
     l_brace = Token('{', TokenEnum.delimiter)
     r_brace = Token('}', TokenEnum.delimiter)
 
@@ -34,119 +204,236 @@ class Replacement(Node):
     end = r_brace
 
     def __init__(self, field_name, conversion=None, format_spec=None):
-        self.field_name = field_name
-        self.conversion = conversion or Conversion()
-        self.format_spec = format_spec or FormatSpec()
+        set_slot(self, 'field_name', field_name)
+        set_slot(self, 'conversion', conversion or Conversion.none)
+        set_slot(self, 'format_spec', format_spec or FormatSpec.empty)
 
     def eval(self, *args, **kwargs):
         return self.format_spec.format(self.conversion.eval(self.field_name.eval(*args, **kwargs)), *args, **kwargs)
 
+    def render(self, args, kwargs, memo=None):
+        """
+        eval for a whole FormatString, which passes along the memo of shared field lookups
+        """
+        return self.format_spec.apply(self.conversion.eval(self.field_name.resolve(args, kwargs, memo)),
+                                      args, kwargs, memo)
+
+    def field_names(self):
+        """
+        yields the FieldName of this field and of every field nested in its spec, outermost first
+        """
+        stack = [self]
+        while stack:
+            replacement = stack.pop()
+            yield replacement.field_name
+            stack.extend(reversed(replacement.format_spec.inners))
+
+    def compile(self, compiler):
+        if compiler.hoisting:
+            return self.compile_statements(compiler)
+        value = self.compile_value(compiler)
+        if not self.format_spec.format_str and self.conversion.char:
+            return value  # conversions return a str, which an empty spec leaves unchanged
+        return self.format_spec.compile(compiler, value)
+
+    def compile_value(self, compiler):
+        return self.conversion.compile(compiler, self.field_name.compile(compiler))
+
+    def compile_statements(self, compiler):
+        """
+        compile for a hoisting Compiler: this field and every field nested in its spec get
+        their value and their result assigned to locals, in the order format looks them up,
+        working from an explicit stack. Returns the local holding the result.
+        """
+        # (replacement, local holding its value, locals holding its rendered inner fields), innermost last
+        stack = [(self, compiler.assign(self.compile_value(compiler)), [])]
+        while True:
+            replacement, value, inners = stack[-1]
+            format_spec = replacement.format_spec
+            if len(inners) < len(format_spec.inners):
+                inner = format_spec.inners[len(inners)]
+                stack.append((inner, compiler.assign(inner.compile_value(compiler)), []))
+                continue
+            stack.pop()
+            if not format_spec.format_str and replacement.conversion.char:
+                result = value
+            else:
+                result = compiler.assign(format_spec.compile(compiler, value, inners))
+            if not stack:
+                return result
+            stack[-1][2].append(result)
+
 
-@EqualityByValue
 class Getter(Node):
+    __slots__ = ()
     def get(self, arg):
         pass
 
+    def accessor(self):
+        """
+        returns a callable equivalent to get, from operator so that it runs in C
+        """
+        pass
+
+    def compile(self, compiler, value):
+        pass
+
+    def path(self):
+        """
+        returns the getter as it is written in a field name
+        """
+        pass
+
 
-@EqualityByValue
 class Attribute(Getter):
+    __slots__ = ('attr',)
     period = Token('.', TokenEnum.punctuation)
 
     def __init__(self, attr):
-        self.attr = attr
+        set_slot(self, 'attr', attr)
 
     def get(self, arg):
         return getattr(arg, self.attr)
 
+    def accessor(self):
+        return attrgetter(self.attr)
+
+    def path(self):
+        return '.' + self.attr
+
+    def compile(self, compiler, value):
+        if compiler.is_attribute_name(self.attr):
+            return '{}.{}'.format(value, self.attr)
+        return 'getattr({}, {!r})'.format(value, self.attr)
+
 
-@EqualityByValue
 class Index(Getter):
+    __slots__ = ('index',)
     l_bracket = Token('[', TokenEnum.punctuation)
     r_bracket = Token(']', TokenEnum.punctuation)
 
     def __init__(self, index):
-        self.index = index
+        set_slot(self, 'index', index)
 
     def get(self, arg):
         return arg[self.index]
 
+    def accessor(self):
+        return itemgetter(self.index)
+
+    def path(self):
+        return '[{}]'.format(self.index)
+
+    def compile(self, compiler, value):
+        return '{}[{!r}]'.format(value, self.index)
+
+
+def fuse_getters(getters: Sequence[Getter]):
+    """
+    returns one callable that applies every getter in turn, or None if there are none.
+    Runs of attributes become a single dotted attrgetter.
+    """
+    accessors = []
+    attributes = []
+    for getter in getters:
+        if isinstance(getter, Attribute):
+            attributes.append(getter.attr)
+            continue
+        if attributes:
+            accessors.append(attrgetter('.'.join(attributes)))
+            attributes = []
+        accessors.append(getter.accessor())
+    if attributes:
+        accessors.append(attrgetter('.'.join(attributes)))
+
+    if len(accessors) < 2:
+        return accessors[0] if accessors else None
+
+    def get(value):
+        for accessor in accessors:
+            value = accessor(value)
+        return value
+    return get
+
 
-@EqualityByValue
 class FieldName(Node):
+    __slots__ = ('argument', 'getters', 'positional', 'get')
+    derived_slots = ('positional', 'get')
+
     def __init__(self, argument: Union[int, str], getters: Sequence[Getter] = None):
-        self.argument = argument
-        self.getters = getters or []
+        set_slot(self, 'argument', argument)
+        set_slot(self, 'getters', tuple(getters or ()))
+        set_slot(self, 'positional', type(argument) is int)
+        set_slot(self, 'get', fuse_getters(self.getters))
+
+    def __reduce__(self):
+        return FieldName, (self.argument, self.getters)
 
     def eval(self, *args, **kwargs):
-        if type(self.argument) == int:
-            value = args[self.argument]
+        value = args[self.argument] if self.positional else kwargs[self.argument]
+        return value if self.get is None else self.get(value)
+
+    def resolve(self, args, kwargs, memo=None):
+        """
+        eval, but remembering the value in memo (when there is one) so that other
+        fields with the same path do not look it up again during this render
+        """
+        value = args[self.argument] if self.positional else kwargs[self.argument]
+        if self.get is None:
+            return value
+        if memo is None:
+            return self.get(value)
+        key = id(self)
+        if key not in memo:
+            memo[key] = self.get(value)
+        return memo[key]
+
+    def path(self):
+        """
+        returns the field name as it is written in a format string
+        """
+        return str(self.argument) + ''.join([getter.path() for getter in self.getters])
+
+    def compile(self, compiler):
+        if self.positional:
+            value = 'args[{}]'.format(self.argument)
         else:
-            value = kwargs[self.argument]
+            value = 'kwargs[{!r}]'.format(self.argument)
 
         for getter in self.getters:
-            value = getter.get(value)
+            value = getter.compile(compiler, value)
 
-        return value
+        return compiler.share(self, value) if self.getters else value
 
 
-@EqualityByValue
 class Conversion(Node):
+    __slots__ = ('char', 'eval')
+    derived_slots = ('eval',)
     exclamation = Token('!', TokenEnum.punctuation)
     hint = exclamation
 
     valid_chars = {'r': repr, 's': str, 'a': ascii, '': lambda string: string}
 
     def __init__(self, char=''):
-        self.eval = Conversion.valid_chars[char]
+        set_slot(self, 'char', char)
+        set_slot(self, 'eval', Conversion.valid_chars[char])
 
+    def __reduce__(self):
+        return Conversion, (self.char,)
 
-@EqualityByValue
-class Sign:
-    plus = Token('+', TokenEnum.punctuation)
-    minus = Token('-', TokenEnum.punctuation)
-    space = Token(' ', TokenEnum.punctuation)
-    valid_tokens = [plus, minus, space]
+    def compile(self, compiler, value):
+        if not self.char:
+            return value
+        return '{}({})'.format(self.eval.__name__, value)
 
 
-@EqualityByValue
-class Align:
-    def left(self, string):
-        return string + self.fill * (self.width - len(string))
-
-    def center(self, string):
-        return self.fill * ((self.width - len(string)) // 2) + string + self.fill * ((self.width - len(string)) // 2)
-
-    def right(self, string):
-        return self.fill * (self.width - len(string)) + string
-
-    def sign(self, string):
-        return self.sign + self.right(string)
-
-    valid_tokens = {Token('<', TokenEnum.punctuation): left,
-                    Token('^', TokenEnum.punctuation): center,
-                    Token('>', TokenEnum.punctuation): right,
-                    Token('=', TokenEnum.punctuation): sign}
-
-    def __init__(self, is_number, fill=' ', char=None, sign=None, width=0):
-        self.fill = fill
-        self.is_number = is_number
-        self.sign = sign
-        self.width = width
-        if char is None:
-            self.align = self.right if is_number else self.left
-        self.align = self.valid_tokens[char]
-        if self.align == self.sign and not is_number:
-            raise ValueError('only numbers may be aligned with \'=\'')
-
-
-@EqualityByValue
 class Type:
     default = ''
     string = 's'
     string_default = string
-    binary = 'board'
+    binary = 'b'
     character = 'c'
-    decimal = 'down'
+    decimal = 'd'
     octal = 'o'
     lower_hex = 'x'
     upper_hex = 'X'
@@ -162,32 +449,175 @@ class Type:
     float_default = ''
 
 
-@EqualityByValue
 class FormatSpec(Node):
+    __slots__ = ('format_str', 'inners', 'pieces', 'nested', 'valid', 'fill', 'align', 'sign', 'alternate', 'zero',
+                 'width', 'grouping', 'precision', 'type', 'fast')
+    derived_slots = ('pieces', 'nested', 'valid', 'fill', 'align', 'sign', 'alternate', 'zero', 'width', 'grouping',
+                     'precision', 'type', 'fast')
     colon = Token(':', TokenEnum.punctuation)
     hint = colon
 
+    # format_spec ::=  [[fill]align][sign][#][0][width][grouping][.precision][type]
+    pattern = re.compile(r'(?:(?P<fill>.)?(?P<align>[<>=^]))?(?P<sign>[-+ ])?(?P<alternate>#)?(?P<zero>0)?'
+                         r'(?P<width>[0-9]+)?(?P<grouping>[,_])?(?:\.(?P<precision>[0-9]+))?(?P<type>[bcdeEfFgGnosxX%])?',
+                         re.DOTALL)
+
     def format(self, string, *args, **kwargs):
-        for inner in self.inners:
-            self.format_str = self.format_str.replace('{}', inner.eval(*args, **kwargs), 1)
-        return string.__format__(self.format_str)
+        if self.fast is not None:
+            return self.fast(self, string)
+        return self.apply(string, args, kwargs)
+
+    def apply(self, string, args, kwargs, memo=None):
+        if self.fast is not None:
+            return self.fast(self, string)
+        if self.nested:
+            return self.apply_nested(string, args, kwargs, memo)
+        format_str = self.pieces[0]
+        for inner, piece in zip(self.inners, self.pieces[1:]):
+            format_str += inner.render(args, kwargs, memo) + piece
+        return FormatSpec.format_value(string, format_str)
+
+    def apply_nested(self, string, args, kwargs, memo):
+        """
+        apply for specs whose inner fields have specs with fields of their own, rendered
+        from an explicit stack so that no depth of nesting can exhaust the Python stack.
+        Fields are looked up in the same order as by apply: each field before its spec.
+        """
+        # (spec, value it formats, its inner fields rendered so far), innermost last
+        stack = [(self, string, [])]
+        while True:
+            format_spec, value, rendered = stack[-1]
+            if len(rendered) < len(format_spec.inners):
+                inner = format_spec.inners[len(rendered)]
+                value = inner.conversion.eval(inner.field_name.resolve(args, kwargs, memo))
+                stack.append((inner.format_spec, value, []))
+                continue
+            stack.pop()
+            if format_spec.fast is not None:
+                result = format_spec.fast(format_spec, value)
+            else:
+                format_str = format_spec.pieces[0] + ''.join([text + piece for text, piece in
+                                                              zip(rendered, format_spec.pieces[1:])])
+                result = FormatSpec.format_value(value, format_str)
+            if not stack:
+                return result
+            stack[-1][2].append(result)
+
+    @staticmethod
+    def format_value(value, format_str):
+        cache = FormatCache.cache
+        if cache is not None and type(value) in FormatCache.cacheable:
+            return cache.format(value, format_str)
+        return value.__format__(format_str)
+
+    def compile(self, compiler, value, inners=None):
+        """
+        inners are expressions for the inner fields if they have already been compiled
+        """
+        pieces = self.pieces
+        if inners is None:
+            inners = [inner.compile(compiler) for inner in self.inners]
+        spec = [repr(pieces[0])] if pieces[0] else []
+        for inner, piece in zip(inners, pieces[1:]):
+            spec.append(inner)
+            if piece:
+                spec.append(repr(piece))
+        function = compiler.constant(FormatCache.format_cached) if FormatCache.cache is not None and self.format_str \
+            else 'format'
+        return '{}({}, {})'.format(function, value, ' + '.join(spec) or "''")
 
     def __init__(self, format_str: str='', inners=None):
-        self.format_str = format_str
-        self.inners = inners or []
+        set_slot(self, 'format_str', format_str)
+        set_slot(self, 'inners', tuple(inners or ()))
+        # the text around each inner field, so rendering never has to search the spec
+        set_slot(self, 'pieces', tuple(format_str.split('{}')) if self.inners else (format_str,))
+        # whether an inner field has inner fields of its own, see apply_nested
+        set_slot(self, 'nested', any(inner.format_spec.inners for inner in self.inners))
+        self.parse()
+
+    def __reduce__(self):
+        return FormatSpec, (self.format_str, self.inners)
+
+    def parse(self):
+        """
+        splits a spec without inner fields into its parts once, up front, and picks
+        the fastest way to apply it. Specs that depend on inner fields or that do
+        not match the grammar are left to __format__ (which raises for the latter).
+        """
+        match = None if self.inners else FormatSpec.pattern.fullmatch(self.format_str)
+        set_slot(self, 'valid', match is not None)
+        fields = match.groupdict() if match else {}
+        set_slot(self, 'fill', fields.get('fill'))
+        set_slot(self, 'align', fields.get('align'))
+        set_slot(self, 'sign', fields.get('sign'))
+        set_slot(self, 'alternate', fields.get('alternate') is not None)
+        set_slot(self, 'zero', fields.get('zero') is not None)
+        set_slot(self, 'width', int(fields['width']) if fields.get('width') else None)
+        set_slot(self, 'grouping', fields.get('grouping'))
+        set_slot(self, 'precision', int(fields['precision']) if fields.get('precision') else None)
+        set_slot(self, 'type', fields.get('type'))
+
+        plain = not (self.sign or self.alternate or self.zero or self.grouping)
+        if not self.format_str:
+            set_slot(self, 'fast', FormatSpec.format_empty)
+        elif self.format_str == Type.decimal:
+            set_slot(self, 'fast', FormatSpec.format_decimal)
+        elif self.valid and plain and self.width is not None and self.precision is None \
+                and self.type in (None, Type.string) and self.align != '=':
+            set_slot(self, 'fast', FormatSpec.format_padded_string)
+        else:
+            set_slot(self, 'fast', None)
+
+    # The fast paths only handle the exact builtin types whose output they are known
+    # to reproduce, and defer to __format__ for everything else. Specs without one
+    # (fast is None) go straight to __format__, which beats any Python-level
+    # reimplementation of e.g. '.2f'.
+
+    def format_empty(self, value):
+        if type(value) is str:
+            return value
+        if type(value) is int or type(value) is float:
+            return str(value)
+        return value.__format__('')
+
+    def format_decimal(self, value):
+        if type(value) is int:
+            return str(value)
+        return FormatSpec.format_value(value, self.format_str)
+
+    def format_padded_string(self, value):
+        if type(value) is not str:
+            return FormatSpec.format_value(value, self.format_str)
+        if self.align == '>':
+            return value.rjust(self.width, self.fill or ' ')
+        if self.align == '^':
+            padding = self.width - len(value)
+            if padding <= 0:
+                return value
+            fill = self.fill or ' '
+            return fill * (padding // 2) + value + fill * (padding - padding // 2)
+        return value.ljust(self.width, self.fill or ' ')
+
 
-@EqualityByValue
 class Literal(Node):
-    def __init__(self, text):
-        formatted_text = []
-        i = 0
-        while i < len(text):
-            formatted_text.append(text[i])
-            if text[i] in '{}':
-                i += 2
-            else:
-                i += 1
-        self.text = ''.join(formatted_text)
+    __slots__ = ('text',)
+
+    def __init__(self, text, unescape=True):
+        """
+        text is taken as it appears in a format string, with braces doubled,
+        unless unescape is False
+        """
+        set_slot(self, 'text', text.replace('{{', '{').replace('}}', '}') if unescape else text)
 
     def eval(self, *args, **kwargs):
-        return self.text
\ No newline at end of file
+        return self.text
+
+    def render(self, args, kwargs, memo=None):
+        return self.text
+
+    def compile(self, compiler):
+        return repr(self.text)
+
+
+Conversion.none = Conversion()
+FormatSpec.empty = FormatSpec()
\ No newline at end of file
@@ -0,0 +1,93 @@
+from typing import Iterable, Mapping, Sequence
+
+from .Node import FieldName, FormatSpec, Literal, Node, Replacement
+
+
+def is_bound(field_name: FieldName, args: Sequence, constants: Mapping):
+    if field_name.positional:
+        return field_name.argument < len(args)
+    return field_name.argument in constants
+
+
+def bound(replacement: Replacement, args: Sequence, constants: Mapping):
+    """
+    whether every field replacement refers to, including those nested in its spec, is in args or constants
+    """
+    return all(is_bound(field_name, args, constants) for field_name in replacement.field_names())
+
+
+def fold_spec(replacement: Replacement, args: Sequence, constants: Mapping):
+    """
+    renders the spec of replacement once if all of its inner fields are bound, so that it
+    is parsed up front and can get a fast path instead of being rebuilt on every render
+    """
+    format_spec = replacement.format_spec
+    if not format_spec.inners or not all(bound(inner, args, constants) for inner in format_spec.inners):
+        return replacement
+    format_str = format_spec.pieces[0]
+    for inner, piece in zip(format_spec.inners, format_spec.pieces[1:]):
+        format_str += inner.eval(*args, **constants) + piece
+    return Replacement(replacement.field_name, replacement.conversion, FormatSpec(format_str))
+
+
+def shift(replacement: Replacement, count, shifted):
+    """
+    returns replacement with every positional argument it refers to moved down by count,
+    for when the first count positional arguments have been bound. shifted maps the ids
+    of FieldNames to their replacements, so paths that were shared stay shared.
+    """
+    # (replacement, its inner fields shifted so far), innermost last, so that nesting
+    # of any depth is rebuilt without recursion
+    stack = [(replacement, [])]
+    while True:
+        replacement, inners = stack[-1]
+        if len(inners) < len(replacement.format_spec.inners):
+            stack.append((replacement.format_spec.inners[len(inners)], []))
+            continue
+        stack.pop()
+        field_name = replacement.field_name
+        if field_name.positional:
+            if id(field_name) not in shifted:
+                shifted[id(field_name)] = FieldName(field_name.argument - count, field_name.getters)
+            field_name = shifted[id(field_name)]
+        format_spec = replacement.format_spec
+        if format_spec.inners:
+            format_spec = FormatSpec(format_spec.format_str, inners)
+        replacement = Replacement(field_name, replacement.conversion, format_spec)
+        if not stack:
+            return replacement
+        stack[-1][1].append(replacement)
+
+
+def optimize(nodes: Iterable[Node], constants: Mapping = None, args: Sequence = ()):
+    """
+    returns the smallest list of nodes that renders the same as nodes: fields that only
+    refer to the leading positional arguments in args or to keywords in constants are
+    formatted now and become literals, specs whose inner fields are all bound are rendered
+    now, the remaining positional fields are renumbered to start after args (like
+    functools.partial), empty literals are dropped and adjacent literals are merged.
+    Raises ValueError for a bound field that cannot be formatted yet because its spec
+    depends on fields that are not bound, since it could no longer be looked up later.
+    """
+    constants = constants or {}
+    optimized = []
+    shifted = {}
+    for node in nodes:
+        if isinstance(node, Replacement) and (constants or args):
+            if bound(node, args, constants):
+                node = Literal(node.eval(*args, **constants), unescape=False)
+            else:
+                node = fold_spec(node, args, constants)
+                if is_bound(node.field_name, args, constants):
+                    raise ValueError('cannot bind {!r}: its format spec refers to fields that are not bound'.format(
+                        node.field_name.path()))
+                if args:
+                    node = shift(node, len(args), shifted)
+        if isinstance(node, Literal):
+            if not node.text:
+                continue
+            if optimized and isinstance(optimized[-1], Literal):
+                node = Literal(optimized[-1].text + node.text, unescape=False)
+                optimized.pop()
+        optimized.append(node)
+    return optimized
\ No newline at end of file
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Mapping, Sequence, Union
+
+from .Node import FormatString
+
+
+def render_parallel(format_string: FormatString, rows: Iterable[Union[Sequence, Mapping]], workers=4, chunksize=None):
+    """
+    formats every row like FormatString.format_many, but spreads the rows over a pool
+    of worker threads. The template's compiled renderer is reused and the same function is
+    shared by every thread, which is safe because templates cannot be changed after
+    they are built and rendering keeps all of its state in local variables.
+    Results are returned in the order of rows.
+
+    Under the GIL this only pays off when looking up or formatting the arguments
+    releases it (I/O behind properties or __format__, C extensions, free-threaded builds).
+    """
+    if workers < 1:
+        raise ValueError('workers must be at least 1, not {}'.format(workers))
+    rows = list(rows)
+    if chunksize is None:
+        chunksize = max(1, -(-len(rows) // (workers * 4)))
+    render = format_string.renderer()
+
+    def render_chunk(chunk):
+        return [render(**row) if isinstance(row, Mapping) else render(*row) for row in chunk]
+
+    chunks = [rows[start:start + chunksize] for start in range(0, len(rows), chunksize)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return [line for chunk in executor.map(render_chunk, chunks) for line in chunk]
\ No newline at end of file
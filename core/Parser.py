@@ -1,6 +1,10 @@
 from .Node import Replacement, Literal, Conversion, FormatSpec, FieldName, FormatString, Attribute, Index
+from .Optimizer import optimize
+from typing import Union
+
 from .Scanner import Scanner
 from .Token import Token
+from .TokenStream import TokenStream
 
 from .TokenEnum import TokenEnum
 
@@ -10,12 +14,17 @@ class ParserException(Exception):
 
 
 class Parser:
-    def __init__(self, tokens: Scanner[Token]):
+    def __init__(self, tokens: Union[Scanner[Token], TokenStream]):
         self.tokens = tokens
-        self.format_string = FormatString()
+        self.nodes = []
+        # only set once parse has succeeded, since a FormatString cannot be changed after it is built
+        self.format_string = None
         # None means undecided
         self.automatic = None
         self.automatic_index = -1
+        # every field path seen so far, so that repeats share one FieldName and can be
+        # looked up once per render, see FormatString.shared
+        self.field_names = {}
 
     @staticmethod
     def expect(condition, msg):
@@ -29,13 +38,14 @@ class Parser:
         while self.tokens:
             literal = self.parse_literal()
             if literal:  # is not None
-                self.format_string.append(literal)
+                self.nodes.append(literal)
             else:
                 replacement = self.parse_replacement()
                 if replacement:
-                    self.format_string.append(replacement)
+                    self.nodes.append(replacement)
                 else:
                     raise ParserException('expected a literal or a \'{\'')
+        self.format_string = FormatString(optimize(self.nodes))
         return self.format_string
 
     def parse_literal(self):
@@ -47,18 +57,44 @@ class Parser:
 
     def parse_replacement(self):
         # "{" [field_name] ["!" conversion] [":" format_spec] "}"
-        if self.tokens.peek() != Replacement.hint:
+        if self.tokens.peek() is not Replacement.hint:
             return None
-        self.tokens.index += 1
-        res = Replacement(
-            self.parse_field_name(),
-            self.parse_conversion(),
-            self.parse_format_spec())
-        self.expect(self.tokens.consume() == Replacement.r_brace, "unmatched '{'")
-        return res
+        self.tokens.consume()
+        # the fields whose spec is still being read, innermost last, as
+        # (field_name, conversion, spec text, inner fields). A nested field is pushed
+        # here instead of being parsed by a recursive call.
+        stack = []
+        while True:
+            field_name = self.parse_field_name()
+            conversion = self.parse_conversion()
+            if self.tokens.peek() is FormatSpec.hint:
+                self.tokens.consume()
+                stack.append((field_name, conversion, [], []))
+            else:
+                self.expect(self.tokens.consume() is Replacement.r_brace, "unmatched '{'")
+                replacement = Replacement(field_name, conversion)
+                if not stack:
+                    return replacement
+                stack[-1][2].append('{}')
+                stack[-1][3].append(replacement)
+
+            while stack:
+                token = self.tokens.consume()
+                assert token, "Lexer missed unmatched '{'"
+                if token is Replacement.l_brace:
+                    break  # the nested field is parsed by the next pass of the outer loop
+                elif token is Replacement.r_brace:
+                    field_name, conversion, format_str, inners = stack.pop()
+                    replacement = Replacement(field_name, conversion, FormatSpec(''.join(format_str), inners))
+                    if not stack:
+                        return replacement
+                    stack[-1][2].append('{}')
+                    stack[-1][3].append(replacement)
+                else:
+                    stack[-1][2].append(str(token.value))
 
     def parse_field_name(self):
-        if self.tokens.peek() in [Conversion.hint, FormatSpec.hint, Replacement.end]:
+        if self.tokens.peek() in (Conversion.hint, FormatSpec.hint, Replacement.end):
             if self.automatic is None:
                 self.automatic = True
             if self.automatic:
@@ -80,7 +116,7 @@ class Parser:
 
         getters = []
         while True:
-            if str(self.tokens.peek()) in '!:}':
+            if self.tokens.peek() in (Conversion.hint, FormatSpec.hint, Replacement.end):
                 break
             else:
                 Parser.expect(
@@ -88,10 +124,11 @@ class Parser:
                     str(self.tokens.peek()) + ' is not a valid token in this context. ' +
                     'Expected one of !, :, }, [, .')
 
-        return FieldName(argument.value, getters)
+        field_name = FieldName(argument.value, getters)
+        return self.field_names.setdefault(field_name, field_name) if getters else field_name
 
     def parse_conversion(self):
-        if self.tokens.peek() != Conversion.hint:
+        if self.tokens.peek() is not Conversion.hint:
             return None
         char = self.consume_value(2)
         Parser.expect(char in Conversion.valid_chars, 'expected conversion ({!r}) to be one of r, s, a'.format(char))
@@ -104,36 +141,16 @@ class Parser:
         else:
             return False
 
-    def parse_format_spec(self):
-        if self.tokens.peek() != FormatSpec.hint:
-            return None
-
-        token = self.tokens.consume(2)
-        format_str = []
-        inners = []
-        while token:
-            if token == Replacement.l_brace:
-                self.tokens.backup()
-                inners.append(self.parse_replacement())
-                format_str.append('{}')
-            elif token == Replacement.r_brace:
-                self.tokens.backup()
-                return FormatSpec(''.join(format_str), inners)
-            else:
-                format_str.append(str(token.value))
-            token = self.tokens.consume()
-        assert False, "Lexer missed unmatched '{'"
-
     def parse_index(self, getters):
-        if self.tokens.peek() != Index.l_bracket:
+        if self.tokens.peek() is not Index.l_bracket:
             return False
         index = self.tokens.consume(2)
-        Parser.expect(self.tokens.consume() == Index.r_bracket, "improperly matched '['")
+        Parser.expect(self.tokens.consume() is Index.r_bracket, "improperly matched '['")
         getters.append(Index(index.value))
         return True
 
     def parse_attribute(self, getters):
-        if self.tokens.peek() != Attribute.period:
+        if self.tokens.peek() is not Attribute.period:
             return False
         attribute = self.tokens.consume(2)
         Parser.expect(attribute.token_type == TokenEnum.id, 'expected an id following that period')
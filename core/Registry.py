@@ -0,0 +1,152 @@
+import os
+from collections import namedtuple
+from threading import Lock
+from time import monotonic, perf_counter
+
+from .Formatter import compile_
+from .Node import FormatString
+
+RegistryInfo = namedtuple('RegistryInfo', 'templates compiles reloads failures last_reload max_reload total_reload')
+# template is the last one that compiled (None if none has), error is why the file as of stat did not
+Entry = namedtuple('Entry', 'stat checked template error')
+
+
+class TemplateRegistry:
+    """
+    loads templates by name from the files under root, where the name is the path
+    relative to root with '/' separators. Each template is compiled the first time it
+    is asked for and then only when its file's mtime or size changes, which is checked
+    at most every check_interval seconds per template.
+    Each name has its own lock, and a reload builds the new FormatString off to the side
+    and then replaces the entry with a single assignment, so readers always get either
+    the old or the new template and never wait for a compile unless their own template
+    is the one being reloaded.
+    If a file fails to compile, the error is remembered until the file changes again:
+    the last template that did compile keeps being served (see errors()), and if there
+    never was one, get raises the remembered error without compiling again.
+    Files should be replaced atomically (written elsewhere and renamed into place), or
+    a reload can pick up a half-written template.
+    """
+    def __init__(self, root, check_interval=1.0, encoding='utf-8'):
+        self.root = os.path.realpath(root)
+        self.check_interval = check_interval
+        self.encoding = encoding
+        self.lock = Lock()  # guards locks and the statistics
+        self.locks = {}
+        self.entries = {}
+        self.compiles = 0
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload = self.max_reload = self.total_reload = 0.0
+
+    def path(self, name):
+        path = os.path.realpath(os.path.join(self.root, *name.split('/')))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError('template {!r} is outside of {}'.format(name, self.root))
+        return path
+
+    def get(self, name) -> FormatString:
+        """
+        returns the compiled template called name, raising KeyError if there is no such file
+        """
+        entry = self.entries.get(name)
+        if entry is None or monotonic() - entry.checked >= self.check_interval:
+            entry = self.load(name, entry)
+        if entry.template is None:
+            raise entry.error.with_traceback(None)
+        return entry.template
+
+    def load(self, name, entry):
+        """
+        checks the file behind name and returns its up to date Entry, compiling it if it
+        changed since entry was made
+        """
+        with self.lock:
+            lock = self.locks.setdefault(name, Lock())
+        with lock:
+            current = self.entries.get(name)
+            if current is not entry and current is not None:  # another thread got here first
+                return current
+            path = self.path(name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                self.entries.pop(name, None)
+                raise KeyError(name) from None
+            key = (stat.st_mtime_ns, stat.st_size)
+            if entry is not None and entry.stat == key:
+                entry = self.entries[name] = entry._replace(checked=monotonic())
+                return entry
+
+            start = perf_counter()
+            try:
+                with open(path, encoding=self.encoding, newline='') as file:
+                    template, error = compile_(file.read()), None
+            except FileNotFoundError:
+                self.entries.pop(name, None)
+                raise KeyError(name) from None
+            except Exception as exception:
+                template, error = None, exception
+            elapsed = perf_counter() - start
+            with self.lock:
+                self.compiles += 1
+                if error is not None:
+                    self.failures += 1
+                elif entry is not None:
+                    self.reloads += 1
+                    self.last_reload = elapsed
+                    self.max_reload = max(self.max_reload, elapsed)
+                    self.total_reload += elapsed
+            if template is None and entry is not None:
+                template = entry.template
+            entry = self.entries[name] = Entry(key, monotonic(), template, error)
+            return entry
+
+    def format(self, name, /, *args, **kwargs):
+        return self.get(name).format(*args, **kwargs)
+
+    def refresh(self):
+        """
+        checks every loaded template now, recompiling the ones whose files changed and
+        forgetting the ones whose files are gone. Returns the names that were reloaded
+        successfully.
+        """
+        reloaded = []
+        for name, entry in list(self.entries.items()):
+            try:
+                if self.load(name, entry).template is not entry.template:
+                    reloaded.append(name)
+            except KeyError:
+                pass
+        return reloaded
+
+    def errors(self):
+        """
+        returns {name: exception} for the loaded templates whose current file failed to compile
+        """
+        return {name: entry.error for name, entry in list(self.entries.items()) if entry.error is not None}
+
+    def names(self):
+        """
+        returns the names of every file under root, loaded or not
+        """
+        names = []
+        for directory, _, files in os.walk(self.root):
+            relative = os.path.relpath(directory, self.root)
+            prefix = '' if relative == os.curdir else relative.replace(os.sep, '/') + '/'
+            names.extend(prefix + file for file in files)
+        return sorted(names)
+
+    def info(self):
+        with self.lock:
+            return RegistryInfo(len(self.entries), self.compiles, self.reloads, self.failures,
+                                self.last_reload, self.max_reload, self.total_reload)
+
+    def __getitem__(self, name):
+        return self.get(name)
+
+    def __contains__(self, name):
+        return name in self.entries or os.path.isfile(self.path(name))
+
+    def __len__(self):
+        return len(self.entries)
\ No newline at end of file
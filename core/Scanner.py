@@ -68,6 +68,21 @@ class Scanner(Sequence[T]):
 
         return self.tokens[initial - prev_offset:self.index + next_offset]
 
+    def match(self, pattern, prev_offset=0):
+        """
+        like get_while, but consumes the longest run of tokens matched by the compiled
+        regular expression pattern in one call instead of testing a condition
+        token by token. Only works when self.tokens is a string.
+        """
+        initial = self.index
+        match = pattern.match(self.tokens, initial)
+        if match:
+            self.index = match.end()
+        return self.tokens[initial - prev_offset:self.index]
+
+    def __getitem__(self, index):
+        return self.tokens[index]
+
     def __len__(self):
         return len(self.tokens)
 
@@ -1,12 +1,48 @@
-from ..utils import EqualityByValue
+from .TokenEnum import TokenEnum
+from ..utils import ValueSlots, set_slot
 
 
-@EqualityByValue
-class Token:
-    def __init__(self, value, token_type):
-        self.value = value
-        self.token_type = token_type
+class Token(ValueSlots):
+    """
+    delimiter and punctuation tokens are interned, so there is exactly one
+    Token('{', TokenEnum.delimiter) and the parser can compare them by identity
+    """
+    __slots__ = ('value', 'token_type')
+    interned_types = (TokenEnum.delimiter, TokenEnum.punctuation)
+    interned = {}
+
+    def __new__(cls, value, token_type):
         assert token_type is not None
+        if token_type in Token.interned_types:
+            token = Token.interned.get((value, token_type))
+            if token is not None:
+                return token
+        token = super().__new__(cls)
+        set_slot(token, 'value', value)
+        set_slot(token, 'token_type', token_type)
+        if token_type in Token.interned_types:
+            Token.interned[value, token_type] = token
+        return token
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is Token:
+            return self.value == other.value and self.token_type is other.token_type
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self is other:
+            return False
+        if type(other) is Token:
+            return self.value != other.value or self.token_type is not other.token_type
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.value, self.token_type))
+
+    def __getnewargs__(self):
+        return self.value, self.token_type
 
     def __str__(self):
-        return str(self.value)
+        return str(self.value)
\ No newline at end of file
@@ -0,0 +1,72 @@
+from collections import deque
+from typing import Iterable, TypeVar
+
+T = TypeVar('T')
+
+
+class TokenStream:
+    """
+    the part of the Scanner interface that Parser uses, but pulling tokens
+    lazily from an iterator instead of indexing a list. Only the tokens
+    looked ahead at and the last `history` consumed tokens are kept, so
+    backing up further than that raises an IndexError.
+    """
+    def __init__(self, tokens: Iterable[T], history=2):
+        self.tokens = iter(tokens)
+        self.ahead = deque()
+        self.behind = deque(maxlen=history)
+        self.index = 0
+
+    def fill(self, count):
+        """
+        reads from self.tokens until count tokens are buffered.
+        returns False if the iterator ran out first
+        """
+        while len(self.ahead) < count:
+            try:
+                self.ahead.append(next(self.tokens))
+            except StopIteration:
+                return False
+        return True
+
+    def peek(self, skip=0) -> T:
+        """
+        returns the next token that will be read or None if we are at
+        the end of the input stream.
+        Optional parameter skip specifies how many tokens ahead to look.
+        """
+        if 0 <= skip < len(self.ahead):
+            return self.ahead[skip]
+        if skip < 0:
+            try:
+                return self.behind[skip]
+            except IndexError:
+                return None
+        if self.fill(skip + 1):
+            return self.ahead[skip]
+        return None
+
+    def __bool__(self):
+        return bool(self.ahead) or self.fill(1)
+
+    def backup(self, tokens=1):
+        for _ in range(tokens):
+            if not self.behind:
+                raise IndexError('cannot backup to before the tokens kept by this stream')
+            token = self.behind.pop()
+            # None marks a consume past the end of the stream
+            if token is not None:
+                self.ahead.appendleft(token)
+            self.index -= 1
+
+    def consume(self, tokens=1) -> T:
+        """
+        moves up by tokens tokens and returns the last one consumed,
+        or None if that was past the end of the stream
+        """
+        token = None
+        for _ in range(tokens):
+            token = self.ahead.popleft() if self.ahead or self.fill(1) else None
+            self.behind.append(token)
+        self.index += tokens
+        return token
\ No newline at end of file
@@ -1 +1,8 @@
-from .Formatter import format_
\ No newline at end of file
+from .Formatter import (format_, format_lazy, format_many, format_columns, render_iter, render_into,
+                        render_many_into, render_parallel, render_async, render_bytes, compile_, get_template,
+                        cache_info, cache_clear, set_cache_size, save_bundle, load_bundle, enable_format_cache,
+                        disable_format_cache, format_cache_info)
+from .Instrumentation import Observer, instrument
+from .Registry import TemplateRegistry, RegistryInfo
+from .Mapped import render_file
+from .BufferPool import BufferPool
\ No newline at end of file
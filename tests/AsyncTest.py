@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from unittest import TestCase
+
+from ..core import compile_, render_async
+
+
+class Backend:
+    def __init__(self):
+        self.running = 0
+        self.most = 0
+        self.calls = 0
+
+    async def lookup(self, value, delay=0.01):
+        self.calls += 1
+        self.running += 1
+        self.most = max(self.most, self.running)
+        try:
+            await asyncio.sleep(delay)
+            return value
+        finally:
+            self.running -= 1
+
+
+class AsyncTest(TestCase):
+    def test_render_async(self):
+        backend = Backend()
+
+        async def render():
+            return await render_async('{0} {1.real} {name:>5} {0}', (backend.lookup('a'), backend.lookup(2), 'unused'),
+                                      {'name': backend.lookup('bob'), 'plain': 1})
+
+        self.assertEqual(asyncio.run(render()), 'a 2   bob a')
+        self.assertEqual(backend.most, 3)
+
+    def test_limit(self):
+        backend = Backend()
+        template = compile_(' '.join('{{{}}}'.format(i) for i in range(10)))
+
+        async def render():
+            return await template.render_async([backend.lookup(i) for i in range(10)], limit=3)
+
+        self.assertEqual(asyncio.run(render()), '0 1 2 3 4 5 6 7 8 9')
+        self.assertEqual(backend.most, 3)
+
+    def test_shared_and_plain_arguments(self):
+        backend = Backend()
+
+        async def render():
+            lookup = backend.lookup('x')
+            future = asyncio.get_running_loop().create_future()
+            future.set_result('done')
+            return await compile_('{0}{1}{a}{b}{c}').render_async((lookup, lookup), {'a': lookup, 'b': 1, 'c': future})
+
+        self.assertEqual(asyncio.run(render()), 'xxx1done')
+        self.assertEqual(backend.calls, 1)
+
+    def test_failure_cancels_the_rest(self):
+        cancelled = []
+
+        async def fail():
+            raise KeyError('missing')
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        async def render():
+            with self.assertRaises(KeyError):
+                await compile_('{} {}').render_async((slow(), fail()))
+            await asyncio.sleep(0)
+            return list(cancelled)
+
+        self.assertEqual(asyncio.run(render()), [True])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import TestCase
+
+from ..core import Formatter, compile_
+from ..core.Bundle import TemplateBundle, BundleException, write_bundle
+from ..core.Node import Conversion, FormatSpec
+
+
+class BundleTest(TestCase):
+    templates = ['milk and {}', 'milk and {2:{bob}{0}{1}}', '{0.x[1]!r:>10}', 'no fields {{}}']
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'templates.bundle')
+
+    def tearDown(self):
+        Formatter.load_bundle(None)
+
+    def test_nodes_pickle(self):
+        for format_str in self.templates:
+            template = compile_(format_str)
+            self.assertEqual(pickle.loads(pickle.dumps(template)), template)
+        self.assertEqual(pickle.loads(pickle.dumps(Conversion())).eval('a'), 'a')
+        self.assertIs(pickle.loads(pickle.dumps(FormatSpec('>5'))).fast, FormatSpec.format_padded_string)
+
+    def test_round_trip(self):
+        self.assertEqual(write_bundle(self.path, self.templates + self.templates[:1], compile_), len(self.templates))
+        bundle = TemplateBundle(self.path)
+        self.assertEqual(len(bundle), len(self.templates))
+        self.assertEqual(bundle.templates, {})
+        for format_str in self.templates:
+            self.assertEqual(bundle.get(format_str), compile_(format_str))
+        self.assertIsNone(bundle.get('not in the bundle {}'))
+        bundle.close()
+
+    def test_reloads_when_file_changes(self):
+        write_bundle(self.path, self.templates[:1], compile_)
+        bundle = TemplateBundle(self.path, check_interval=0)
+        self.assertIsNone(bundle.get(self.templates[1]))
+        write_bundle(self.path, self.templates, compile_)
+        os.utime(self.path, ns=(1, 1))
+        self.assertEqual(bundle.get(self.templates[1]), compile_(self.templates[1]))
+        bundle.close()
+
+    def test_not_a_bundle(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'definitely not a bundle')
+        self.assertRaises(BundleException, TemplateBundle, self.path)
+
+    def test_bad_file_after_load(self):
+        Formatter.save_bundle(self.path, self.templates)
+        bundle = Formatter.load_bundle(self.path, check_interval=0)
+        self.assertEqual(Formatter.format_('milk and {}', 'eggs'), 'milk and eggs')
+        os.remove(self.path)
+        self.assertIsNone(bundle.get(self.templates[1]))
+        self.assertEqual(Formatter.format_('{0}{1}', 'a', 'b'), 'ab')
+
+        with open(self.path, 'wb') as file:
+            file.write(b'FMTBNDL\0')
+        self.assertIsNone(bundle.get(self.templates[1]))
+        with open(self.path, 'wb') as file:
+            file.write(b'FMTBNDL\0\x10' + b'\0' * 7 + b'garbage')
+        self.assertIsNone(bundle.get(self.templates[1]))
+        self.assertEqual(Formatter.format_('{}-{}', 'c', 'd'), 'c-d')
+
+        write_bundle(self.path, self.templates, compile_)
+        self.assertEqual(bundle.get(self.templates[1]), compile_(self.templates[1]))
+
+    def test_corrupt_blob(self):
+        Formatter.save_bundle(self.path, ['x{}y'])
+        with open(self.path, 'r+b') as file:
+            file.seek(-5, os.SEEK_END)
+            file.write(b'\xff' * 5)
+        Formatter.load_bundle(self.path)
+        self.assertEqual(Formatter.format_('x{}y', 1), 'x1y')
+
+    def test_format_uses_bundle(self):
+        Formatter.save_bundle(self.path, self.templates)
+        bundle = Formatter.load_bundle(self.path)
+        self.assertEqual(Formatter.format_('milk and {}', 'eggs'), 'milk and eggs')
+        self.assertIn('milk and {}', bundle.templates)
+        self.assertEqual(Formatter.format_('{} not bundled', 1), '1 not bundled')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+from unittest import TestCase
+
+from ..core import BufferPool, compile_, render_bytes
+
+
+class BytesTest(TestCase):
+    def assertRendersBytes(self, format_str, *args, **kwargs):
+        buffer = bytearray(b'prefix')
+        view = render_bytes(format_str, buffer, *args, **kwargs)
+        expected = format_str.format(*args, **kwargs).encode()
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tobytes(), expected)
+        view.release()
+        self.assertEqual(buffer, b'prefix' + expected)
+
+    def test_render_bytes(self):
+        self.assertRendersBytes('')
+        self.assertRendersBytes('{}', 'wörld')
+        self.assertRendersBytes('HTTP/1.1 {} {}\r\n\r\n', 200, 'OK')
+        self.assertRendersBytes('<p>' + 'héllo ' * 20 + '{name!r:>{width}}</p>' + '日本' * 40, name='x', width=5)
+        self.assertRendersBytes('{0.real} {0.real} {buffer}', 3, buffer='b')
+
+    def test_pre_encoded_literals(self):
+        long = 'ü' * 64
+        render = compile_('{}' + long + '{}-{}').compile_bytes()
+        self.assertEqual(list(render.__globals__.values()).count(long.encode()), 1)
+        self.assertIn("''.join((format(args[1], ''), '-', format(args[2], ''),)).encode('utf-8')", render.source)
+        self.assertEqual(bytes(render(bytearray(), 1, 2, 3)), ('1' + long + '2-3').encode())
+        latin = compile_('{}é').compile_bytes('latin-1')
+        self.assertEqual(bytes(latin(bytearray(), 'ß')), 'ßé'.encode('latin-1'))
+
+    def test_failure_leaves_buffer(self):
+        buffer = bytearray(b'kept')
+        self.assertRaises(IndexError, render_bytes, '{} {} ' + 'x' * 100, buffer, 1)
+        self.assertRaises(UnicodeEncodeError, render_bytes, 'a{}', buffer, '\ud800')
+        self.assertEqual(buffer, b'kept')
+
+    def test_buffer_pool(self):
+        pool = BufferPool(size=1, max_capacity=100)
+        with pool.buffer() as buffer:
+            view = render_bytes('{}!', buffer, 'hi')
+            self.assertEqual(view, b'hi!')
+            view.release()
+        self.assertEqual(len(pool), 1)
+        self.assertIs(pool.acquire(), buffer)
+        self.assertEqual(buffer, b'')
+
+        with pool.buffer() as buffer:
+            view = render_bytes('{}', buffer, 'x')
+        self.assertEqual(len(pool), 0)  # still exported, so dropped
+        view.release()
+        with pool.buffer() as buffer:
+            buffer += b'x' * 101
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+from unittest import TestCase
+
+from ..core import Formatter
+from ..core.Node import FormatString
+from ..utils import LRUCache
+
+
+class LRUCacheTest(TestCase):
+    def test_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        self.assertEqual(cache.get('a', str.upper), 'A')
+        self.assertEqual(cache.get('a', str.upper), 'A')
+        info = cache.info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.get('a', str.upper)
+        cache.get('b', str.upper)
+        cache.get('a', str.upper)
+        cache.get('c', str.upper)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.info().evictions, 1)
+
+    def test_resize(self):
+        cache = LRUCache(maxsize=4)
+        for key in 'abcd':
+            cache.get(key, str.upper)
+        cache.resize(1)
+        self.assertEqual(len(cache), 1)
+        self.assertIn('d', cache)
+        self.assertRaises(ValueError, cache.resize, -1)
+
+    def test_zero_size_disables(self):
+        cache = LRUCache(maxsize=0)
+        cache.get('a', str.upper)
+        self.assertEqual(len(cache), 0)
+
+    def test_failed_factory_is_not_cached(self):
+        cache = LRUCache()
+
+        def fail(key):
+            raise ValueError(key)
+
+        self.assertRaises(ValueError, cache.get, 'a', fail)
+        self.assertNotIn('a', cache)
+
+
+class TemplateCacheTest(TestCase):
+    def setUp(self):
+        Formatter.cache_clear()
+
+    def test_repeat_calls_skip_compilation(self):
+        Formatter.format_('milk and {}', 'eggs')
+        Formatter.format_('milk and {}', 'ham')
+        info = Formatter.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+    def test_get_template(self):
+        template = Formatter.get_template('{a}')
+        self.assertIsInstance(template, FormatString)
+        self.assertIs(template, Formatter.get_template('{a}'))
+
+    def test_cached_nested_spec_is_reusable(self):
+        format_str = 'milk and {:.>{}}'
+        self.assertEqual(Formatter.format_(format_str, 'eggs', 10), 'milk and ......eggs')
+        self.assertEqual(Formatter.format_(format_str, 'eggs', 6), 'milk and ..eggs')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,61 @@
+import unittest
+from collections import namedtuple
+from unittest import TestCase
+
+from ..core import format_columns
+from ..core.Columnar import numpy, printf_spec
+from ..core.Node import FormatSpec
+
+Item = namedtuple('Item', 'name')
+
+
+class ColumnarTest(TestCase):
+    def assertColumns(self, format_str, columns):
+        rows = len(next(iter(columns.values())))
+        expected = []
+        for row in range(rows):
+            args = [columns[index][row] for index in sorted(key for key in columns if isinstance(key, int))]
+            kwargs = {key: column[row] for key, column in columns.items() if not isinstance(key, int)}
+            expected.append(format_str.format(*args, **kwargs))
+        self.assertEqual(format_columns(format_str, columns), expected)
+
+    def test_numeric(self):
+        self.assertColumns('{id:>8d} {price:10.2f} {qty:,}',
+                           {'id': [1, 22, -333], 'price': [1.5, 2, -0.001], 'qty': [1000, 10, 1234567]})
+        self.assertColumns('{0:+d}|{0:<6x}|{1:e}|{1:.3F}', {0: [0, 255, -7], 1: [1e100, float('inf'), 0.5]})
+
+    def test_fallback(self):
+        self.assertColumns('{:#x} {!r:>6} {:^7}', {0: [10, 11], 1: ['a', 'b'], 2: [1.25, True]})
+        self.assertColumns('{0.name[0]}: {1:d}', {0: [Item('ab'), Item('cd')], 1: [True, False]})
+        self.assertColumns('{:.>{}}', {0: ['eggs', 'ham'], 1: [6, 5]})
+
+    def test_printf_spec(self):
+        self.assertEqual(printf_spec(FormatSpec('>8d')), ('%8d', (int,)))
+        self.assertEqual(printf_spec(FormatSpec('<+010.2f')), None)
+        self.assertEqual(printf_spec(FormatSpec(' 10.2f')), ('% 10.2f', (int, float)))
+        self.assertEqual(printf_spec(FormatSpec(',')), None)
+
+    def test_missing_column(self):
+        self.assertRaises(IndexError, format_columns, '{0} {1}', {0: [1, 2]})
+        self.assertRaises(IndexError, format_columns, '{0:{2}}', {0: [1], 1: [2]})
+        self.assertRaises(IndexError, format_columns, '{0:{1}}', {0: [1], 2: [2]})
+        self.assertRaises(KeyError, format_columns, '{a}', {0: [1]})
+
+    @unittest.skipUnless(numpy, 'needs numpy')
+    def test_numpy(self):
+        for dtype in ('float32', 'float64', 'float16', 'int8', 'int64', 'uint32', 'bool', 'object'):
+            column = numpy.array([0.1, 1, 2.5], dtype=dtype) if 'float' in dtype or dtype == 'object' \
+                else numpy.array([0, 1, 3], dtype=dtype)
+            for format_str in ('{}', '{:g}', '{:>8}', '{!r}'):
+                if format_str == '{:g}' and dtype in ('bool', 'object'):
+                    continue
+                self.assertEqual(format_columns(format_str, {0: column}), [format_str.format(value) for value in column],
+                                 (dtype, format_str))
+
+    def test_lengths(self):
+        self.assertEqual(format_columns('x{}', {0: []}), [])
+        self.assertRaises(ValueError, format_columns, '{a}{b}', {'a': [1], 'b': [1, 2]})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+import unittest
+from collections import namedtuple
+from unittest import TestCase
+
+from ..core import compile_
+from ..core.Node import FormatString, Replacement, FieldName, Attribute, Index, Conversion, FormatSpec
+
+Weighted = namedtuple('Weighted', 'weight')
+
+
+class CompilerTest(TestCase):
+    def assertCompiles(self, format_str, *args, **kwargs):
+        template = compile_(format_str)
+        expected = format_str.format(*args, **kwargs)
+        self.assertEqual(template.format(*args, **kwargs), expected)
+        self.assertEqual(template.compile()(*args, **kwargs), expected)
+
+    def test_literal(self):
+        self.assertCompiles('')
+        self.assertCompiles("abracashow {{ 'quotes' \\ }}")
+
+    def test_fields(self):
+        self.assertCompiles('milk and {}', 'eggs')
+        self.assertCompiles('{1} {0} {1}', 'a', 'b')
+        self.assertCompiles('Units destroyed: {players[0]}', players=[1, 2, 3, 4])
+        self.assertCompiles('Weight in tons {0.weight}', Weighted(5))
+        self.assertCompiles('{0[key]}', {'key': 'value'})
+
+    def test_conversion_and_spec(self):
+        self.assertCompiles('Bring out the {name!r}', name=Weighted(5))
+        self.assertCompiles('milk and {!s:>10}', 'eggs')
+        self.assertCompiles('milk and {2:{bob}{0}{1}}', '>', 10, 'eggs', bob='.')
+
+    def test_awkward_attribute_names(self):
+        template = FormatString([Replacement(FieldName(0, [Attribute('if'), Index('a b')]))])
+
+        class Foo:
+            pass
+
+        foo = Foo()
+        setattr(foo, 'if', {'a b': 'ok'})
+        self.assertEqual(template.compile()(foo), 'ok')
+
+    def test_attribute_names_that_normalize(self):
+        class Foo:
+            pass
+
+        foo = Foo()
+        foo.fi = foo.H = 'plain'
+        setattr(foo, '\ufb01', 'lig')
+        setattr(foo, '\u210c', 'fraktur')
+        for format_str in ['{0.\ufb01}', '{0.\u210c}']:
+            self.assertNotIn('.' + format_str[3], compile_(format_str).compile().source)
+            self.assertCompiles(format_str, foo)
+            self.assertEqual(compile_(format_str).compile_bytes()(bytearray(), foo).tobytes().decode(),
+                             format_str.format(foo))
+
+    def test_errors_match_interpreter(self):
+        function = compile_('{} {name}').compile()
+        self.assertRaises(IndexError, function)
+        self.assertRaises(KeyError, function, 1)
+        self.assertRaises(ValueError, compile_('{:d}').compile(), 'eggs')
+
+    def test_repeated_paths_are_looked_up_once(self):
+        function = compile_('{0.real}{0.imag}{0.real:{0.real}}{0}').compile()
+        self.assertIn('(_f0 := args[0].real)', function.source)
+        self.assertEqual(function.source.count('args[0].real'), 1)
+        self.assertEqual(function(2), '20 22')
+
+    def test_deep_nesting(self):
+        template = compile_('{0:{1:{2}}}|{3.real:{1:{2}}}{3.real}')
+        self.assertEqual(template.compile()(7, 5, 'd', 8), '    7|    88')
+        self.assertEqual(template.compile().source.count('args[3].real'), 1)
+        self.assertIn('    _h0 = args[0]\n', template.compile().source)
+        depth = 2000
+        format_str = ''.join('{%d:' % i for i in range(depth)) + '}' * depth
+        args = ('x', 4) + (1,) * (depth - 2)
+        template = compile_(format_str)
+        self.assertEqual(template.compile()(*args), template.format(*args))
+        self.assertEqual(template.format_many([args]), ['x   '])
+        self.assertEqual(template.compile_bytes()(bytearray(), *args).tobytes(), b'x   ')
+
+    def test_source(self):
+        function = FormatString([Replacement(FieldName('a'), Conversion('r'), FormatSpec('>5'))]).compile()
+        self.assertEqual(function.source, "def render(*args, **kwargs):\n    return format(repr(kwargs['a']), '>5')\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import sys
+import unittest
+from threading import Barrier, Thread
+from unittest import TestCase
+
+from ..core import get_template, render_parallel
+from ..core.Node import FieldName, FormatSpec, Literal
+
+
+class ConcurrencyTest(TestCase):
+    format_str = '{0:{fill}>{1}} {name!r:^{2}} {3:.{4}f}'
+
+    def row(self, i):
+        return ('x' * (i % 7), i % 13, 10 + i % 5, i / 7, i % 4), {'fill': '*.-'[i % 3], 'name': 'n{}'.format(i)}
+
+    def test_templates_are_immutable(self):
+        template = get_template(self.format_str)
+        self.assertRaises(AttributeError, setattr, template, 'nodes', ())
+        self.assertRaises(AttributeError, setattr, template.nodes[0].format_spec, 'format_str', '')
+        self.assertRaises(AttributeError, delattr, Literal('a'), 'text')
+        self.assertRaises(AttributeError, setattr, FieldName(0), 'argument', 1)
+        self.assertIsInstance(template.nodes, tuple)
+
+    def test_nested_spec_is_reentrant(self):
+        spec = FormatSpec('{}>{}', [get_template('{}').nodes[0], get_template('{1}').nodes[0]])
+        self.assertEqual(spec.pieces, ('', '>', ''))
+        self.assertEqual(spec.format('a', '*', 3), '**a')
+        self.assertEqual(spec.format('a', '.', 4), '...a')
+        self.assertEqual(spec.format_str, '{}>{}')
+
+    def test_shared_template_stress(self):
+        template = get_template(self.format_str)
+        threads = 8
+        barrier = Barrier(threads)
+        failures = []
+
+        def work(offset):
+            barrier.wait()
+            for i in range(offset, 2000, threads):
+                args, kwargs = self.row(i)
+                for render in (template.format, template.compile()):
+                    result = render(*args, **kwargs)
+                    if result != self.format_str.format(*args, **kwargs):
+                        failures.append((i, result))
+
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            workers = [Thread(target=work, args=(offset,)) for offset in range(threads)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        self.assertEqual(failures, [])
+
+    def test_render_parallel_is_ordered(self):
+        rows = [self.row(i)[1] for i in range(500)]
+        self.assertEqual(render_parallel('{name}{fill}', rows, workers=8, chunksize=7),
+                         ['{name}{fill}'.format(**row) for row in rows])
+        positional = [self.row(i)[0] for i in range(100)]
+        self.assertEqual(render_parallel(get_template('{}|{}'), positional, workers=3),
+                         ['{}|{}'.format(*row) for row in positional])
+        self.assertEqual(render_parallel('{}', []), [])
+        self.assertRaises(ValueError, render_parallel, '{}', [(1,)], workers=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
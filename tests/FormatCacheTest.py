@@ -0,0 +1,77 @@
+import unittest
+from unittest import TestCase
+
+from ..core import compile_, disable_format_cache, enable_format_cache, format_, format_cache_info
+
+
+class FormatCacheTest(TestCase):
+    def tearDown(self):
+        disable_format_cache()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(format_cache_info())
+        self.assertEqual(format_('{:>5}', 42), '   42')
+
+    def test_hits(self):
+        enable_format_cache()
+        for _ in range(3):
+            self.assertEqual(format_('{:>5} {:^7} {:,}', 404, 'ERROR', 10 ** 6), '  404  ERROR  1,000,000')
+        info = format_cache_info()
+        # padding a str is quicker than a lookup, so 'ERROR' is never cached
+        self.assertEqual((info.hits, info.misses, info.currsize), (4, 2, 2))
+
+    def test_keys(self):
+        enable_format_cache()
+        self.assertEqual(format_('{:>5}{:>5}{:>5}{:>5}', 1, True, 1.0, 'True'), '    1    1  1.0 True')
+        self.assertEqual(format_('{:>5}{:>5}', -0.0, 0.0), ' -0.0  0.0')
+        self.assertEqual(format_('{:>5}{:<5}', 1, 1), '    11    ')
+        self.assertEqual(format_cache_info().currsize, 3)
+        self.assertEqual(format_('{:.70}', 'x' * 65), 'x' * 65)
+        self.assertEqual(format_cache_info().currsize, 3)
+        self.assertEqual(format_('{:>5}{:>5}', 2 ** 31, -2 ** 31), '{:>5}{:>5}'.format(2 ** 31, -2 ** 31))
+        self.assertEqual(format_cache_info().currsize, 3)
+        self.assertEqual(format_('{:>5}', 2 ** 31 - 1), '2147483647')
+        self.assertEqual(format_cache_info().currsize, 4)
+        self.assertRaises(ValueError, format_, '{:d}', 'x')
+
+    def test_eviction(self):
+        enable_format_cache(maxsize=2)
+        for value in range(5):
+            format_('{:03}', value)
+        info = format_cache_info()
+        self.assertEqual((info.evictions, info.currsize), (3, 2))
+        # first in, first out: a hit does not keep 3 from being evicted before 4
+        format_('{:03}', 3)
+        format_('{:03}', 5)
+        self.assertEqual(format_cache_info().hits, 1)
+        format_('{:03}', 4)
+        self.assertEqual(format_cache_info().hits, 2)
+        format_('{:03}', 3)
+        self.assertEqual(format_cache_info().hits, 2)
+        self.assertRaises(ValueError, enable_format_cache, 0)
+
+    def test_compiled(self):
+        plain = compile_('{:>5}|{}').compile()
+        enable_format_cache()
+        cached = compile_('{:>5}|{}').compile()
+        self.assertIn('format(args[1]', cached.source)
+        self.assertEqual(plain(7, 'a'), cached(7, 'a'))
+        self.assertEqual(cached(7, 'a'), '    7|a')
+        cached(7, 'a')
+        self.assertEqual(format_cache_info()[:2], (2, 1))
+        disable_format_cache()
+        self.assertEqual(cached(8, 'b'), '    8|b')
+
+    def test_renderer_follows_cache(self):
+        template = compile_('{:>5}|{}')
+        plain = template.renderer()
+        enable_format_cache()
+        self.assertIsNot(template.renderer(), plain)
+        self.assertEqual(template.format_many([(7, 'a')]), ['    7|a'])
+        self.assertEqual(format_cache_info()[:2], (0, 1))
+        disable_format_cache()
+        self.assertIn('format(args[0]', template.renderer().source)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
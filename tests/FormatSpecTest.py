@@ -0,0 +1,57 @@
+import unittest
+from decimal import Decimal
+from unittest import TestCase
+
+from ..core import format_
+from ..core.Node import Conversion, FieldName, FormatSpec, Replacement
+
+
+class Custom:
+    def __format__(self, format_spec):
+        return 'custom<{}>'.format(format_spec)
+
+
+class FormatSpecTest(TestCase):
+    values = ['', 'eggs', 'αβγ', 0, 42, -7, 10 ** 20, True, 0.0, -0.0, 3.14159, 1e300, float('inf'), float('nan'),
+              Decimal('2.50'), Custom()]
+    specs = ['', 'd', 's', '10', '>10', '<10s', '*^9', '^10s', '.2f', '.0f', '.10f', '08.3f', '+d', ',', '_x', '#o',
+             '=10', '010', '1']
+
+    def test_parse(self):
+        spec = FormatSpec('*<+#012,.3f')
+        self.assertEqual((spec.fill, spec.align, spec.sign, spec.alternate, spec.zero, spec.width, spec.grouping,
+                          spec.precision, spec.type), ('*', '<', '+', True, True, 12, ',', 3, 'f'))
+        self.assertTrue(spec.valid)
+        self.assertFalse(FormatSpec('abc').valid)
+        self.assertFalse(FormatSpec('>{}', [Replacement(FieldName(0))]).valid)
+
+    def test_parsed_parts_are_derived(self):
+        self.assertEqual(FormatSpec('>10').values(), ('>10', ()))
+        self.assertEqual(repr(FormatSpec('>10')), "<FormatSpec(format_str: '>10', inners: ())>")
+        self.assertEqual(hash(FormatSpec('>10')), hash(FormatSpec('>10')))
+        self.assertEqual(Conversion('r').values(), ('r',))
+
+    def test_fast_paths(self):
+        self.assertIs(FormatSpec('').fast, FormatSpec.format_empty)
+        self.assertIs(FormatSpec('d').fast, FormatSpec.format_decimal)
+        self.assertIs(FormatSpec('>10').fast, FormatSpec.format_padded_string)
+        self.assertIsNone(FormatSpec('.2f').fast)
+
+    def test_matches_builtin(self):
+        for format_str in self.specs:
+            spec = FormatSpec(format_str)
+            for value in self.values:
+                try:
+                    expected = format(value, format_str)
+                except ValueError:
+                    self.assertRaises(ValueError, spec.format, value)
+                else:
+                    self.assertEqual(spec.format(value), expected, (format_str, value))
+
+    def test_digits_in_spec(self):
+        self.assertEqual(format_('{:08.3f}|{:010}|{:%H:%M}', 3.14159, 42, Custom()),
+                         '0003.142|0000000042|custom<%H:%M>')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
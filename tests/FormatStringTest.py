@@ -1,4 +1,6 @@
+import pickle
 from collections import namedtuple
+from io import StringIO
 from unittest import TestCase
 import unittest
 
@@ -6,7 +8,7 @@ from ..core.Lexer import Lexer
 from ..core.Node import FieldName, Attribute, Index, FormatString, Replacement
 from ..core.Parser import Parser
 
-from ..core import format_
+from ..core import compile_, format_, format_lazy, format_many, render_iter, render_into, render_many_into
 from ..utils.EqualityByValue import EqualityByValue
 
 
@@ -16,6 +18,16 @@ class Foo:
         self.y = y
 
 
+class Counting:
+    def __init__(self):
+        self.lookups = 0
+
+    @property
+    def name(self):
+        self.lookups += 1
+        return 'eggs'
+
+
 class FieldNameTest(TestCase):
     def test_attribute(self):
         attribute = Attribute('x')
@@ -46,6 +58,25 @@ class FieldNameTest(TestCase):
             4,
             [Attribute('x'), Attribute('y')]).eval(0, 1, 2, 3, foo_3))
 
+    def test_fused_getters(self):
+        foo = Foo(Foo({'a': [Foo(1, 2)]}, 3), 4)
+        self.assertIsNone(FieldName(0).get)
+        self.assertEqual(FieldName(0, [Attribute('x'), Attribute('y')]).get(foo), 3)
+        self.assertEqual(FieldName(0, [Attribute('x'), Attribute('x'), Index('a'), Index(0), Attribute('y')]).get(foo), 2)
+        self.assertRaises(AttributeError, FieldName(0, [Attribute('z')]).eval, foo)
+        self.assertRaises(IndexError, FieldName(0, [Index(1)]).eval, [])
+
+    def test_repeated_paths_are_looked_up_once(self):
+        template = compile_('{user.name} {user.name:>6} {0:{user.name[0]}>4} {user.name!r}')
+        user = Counting()
+        self.assertEqual(template.format(1, user=user), "eggs   eggs eee1 'eggs'")
+        self.assertEqual(user.lookups, 2)  # user.name and user.name[0] are different paths
+        template.format(2, user=user)
+        self.assertEqual(user.lookups, 4)
+        self.assertEqual(len(template.shared), 1)
+        self.assertEqual(template, pickle.loads(pickle.dumps(template)))
+        self.assertEqual(len(pickle.loads(pickle.dumps(template)).shared), 1)
+
     def test_wrapper(self):
         @EqualityByValue
         class Foo:
@@ -54,6 +85,14 @@ class FieldNameTest(TestCase):
 
         self.assertEqual(Foo([1, 2]), Foo([1, 2]))
 
+    def test_value_slots(self):
+        field_name = FieldName(0, [Attribute('x'), Index(1)])
+        self.assertFalse(hasattr(field_name, '__dict__'))
+        self.assertEqual(field_name, FieldName(0, (Attribute('x'), Index(1))))
+        self.assertNotEqual(field_name, FieldName(0, [Attribute('x'), Index(2)]))
+        self.assertEqual(hash(field_name), hash(FieldName(0, [Attribute('x'), Index(1)])))
+        self.assertEqual(repr(Attribute('x')), "<Attribute(attr: 'x')>")
+
     def test_format_string_0(self):
         foo = Foo([0, 2], 5)
         format_str = '{0.x[1]}'
@@ -141,6 +180,72 @@ class FieldNameTest(TestCase):
         format_str = "Bring out the {name!r}"
         self.assertEqual(format_(format_str, name=Weighted(5)), "Bring out the Weighted(weight=5)")
 
+    def test_format_many_0(self):
+        format_str = 'milk and {:.>{}}'
+        self.assertEqual(format_many(format_str, [('eggs', 6), ['ham', 5]]), ['milk and ..eggs', 'milk and ..ham'])
+
+    def test_format_many_1(self):
+        format_str = '{name} has {eggs} eggs'
+        self.assertEqual(format_many(format_str, iter([{'name': 'bob', 'eggs': 2}, {'name': 'alice', 'eggs': 12}])),
+                         ['bob has 2 eggs', 'alice has 12 eggs'])
+        self.assertEqual(format_many(format_str, []), [])
+        self.assertRaises(KeyError, format_many, format_str, [(12,)])
+
+    def test_renderer_is_reused(self):
+        template = compile_('{name} has {eggs} eggs')
+        renderer = template.renderer()
+        self.assertIs(template.renderer(), renderer)
+        self.assertEqual(template.format_many([{'name': 'bob', 'eggs': 2}]), ['bob has 2 eggs'])
+        self.assertEqual(list(template.render_many_iter([{'name': 'al', 'eggs': 1}])), ['al has 1 eggs'])
+        self.assertIs(template.renderer(), renderer)
+        self.assertEqual(template, compile_('{name} has {eggs} eggs'))
+        self.assertEqual(pickle.loads(pickle.dumps(template)), template)
+
+    def test_deep_nesting(self):
+        self.assertEqual(format_('{0:{1:{2}}}|{3.real:{4!s}{1:{2}}}', 7, 5, 'd', 8, '<'), '    7|8    ')
+        depth = 2000
+        format_str = ''.join('{%d:' % i for i in range(depth)) + '}' * depth
+        self.assertEqual(format_(format_str, *[''] * depth), '')
+        self.assertEqual(format_(format_str, 'x', 4, *[1] * (depth - 2)), 'x   ')
+        shifted = '{0}' + ''.join('{%d:' % i for i in range(1, depth + 1)) + '}' * depth
+        self.assertEqual(compile_(shifted).partial('y').format('x', 4, *[1] * (depth - 2)), 'yx   ')
+
+    def test_render_iter(self):
+        format_str = 'milk and {:.>{}} and {name}'
+        self.assertEqual(list(render_iter(format_str, 'eggs', 6, name='ham')), ['milk and ', '..eggs', ' and ', 'ham'])
+
+    def test_render_into(self):
+        chunks = []
+        render_into('{} and {}', chunks.append, 'milk', 'eggs')
+        self.assertEqual(chunks, ['milk', ' and ', 'eggs'])
+        output = StringIO()
+        render_many_into('{}\n', output, [('milk',), ('eggs',)])
+        self.assertEqual(output.getvalue(), 'milk\neggs\n')
+
+    def test_introspection(self):
+        template = compile_('{2} {user.name} {0:{width}} {user[tags][0]} {2} {user.name}')
+        self.assertEqual(template.positional, (0, 2))
+        self.assertEqual(template.keywords, ('user', 'width'))
+        self.assertEqual(template.paths(), ('2', 'user.name', '0', 'width', 'user[tags][0]'))
+        self.assertEqual(compile_('{}{}').positional, (0, 1))
+        self.assertEqual(compile_('plain').paths(), ())
+
+    def test_format_lazy(self):
+        calls = []
+
+        def expensive(value):
+            def compute():
+                calls.append(value)
+                return value
+            return compute
+
+        format_str = '{0} {0} {2} {name}'
+        self.assertEqual(format_lazy(format_str, expensive('a'), expensive('b'), 'c', name=expensive('n'),
+                                     unused=expensive('u')), 'a a c n')
+        self.assertEqual(calls, ['a', 'n'])
+        self.assertEqual(format_lazy('{}', lambda: len), str(len))
+        self.assertRaises(KeyError, format_lazy, '{name}', other=lambda: 1)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
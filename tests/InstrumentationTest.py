@@ -0,0 +1,82 @@
+import json
+from threading import Barrier, Thread
+from unittest import TestCase
+
+from ..core import Instrumentation, Observer, cache_clear, format_, instrument
+
+
+class InstrumentationTest(TestCase):
+    def setUp(self):
+        cache_clear()
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(Instrumentation.active.get())
+        self.assertEqual(format_('{} {}', 1, 2), '1 2')
+
+    def test_phases(self):
+        with instrument() as observer:
+            self.assertEqual(format_('{0.real:>{1}}!', 3, 4), '   3!')
+            self.assertEqual(format_('{0.real:>{1}}!', 5, 2), ' 5!')
+        self.assertIsNone(Instrumentation.active.get())
+        phases = observer.stats()['phases']
+        self.assertEqual(phases['lex']['calls'], 1)
+        self.assertEqual(phases['parse']['calls'], 1)
+        self.assertEqual(phases['render']['calls'], 2)
+        for phase in ('field', 'conversion', 'format_spec'):
+            self.assertEqual(phases[phase]['calls'], 2)
+        self.assertGreaterEqual(phases['render']['max'], phases['render']['mean'])
+
+    def test_node_counts(self):
+        with instrument() as observer:
+            format_('a{0[1].real!r:{1}}b{2}', [0, 1], 3, 4)
+        self.assertEqual(observer.stats()['nodes'], {'Literal': 2, 'Replacement': 3, 'FieldName': 3, 'Index': 1,
+                                                     'Attribute': 1, 'Conversion': 1, 'FormatSpec': 1})
+
+    def test_slowest_and_export(self):
+        observer = Observer()
+        with instrument(observer):
+            format_('{}', 1)
+            format_('{:>100}' * 50, *range(50))
+        slowest = observer.slowest(1)
+        self.assertEqual(slowest[0][0], '{:>100}' * 50)
+        json.dumps(observer.stats())
+        observer.reset()
+        self.assertEqual(observer.stats(), {'phases': {}, 'nodes': {}})
+
+    def test_nested_instrument_restores(self):
+        with instrument() as outer:
+            with instrument() as inner:
+                format_('{}', 1)
+            self.assertIs(Instrumentation.active.get(), outer)
+        self.assertEqual(outer.stats()['phases'], {})
+        self.assertEqual(inner.stats()['phases']['render']['calls'], 1)
+
+    def test_threads_do_not_share_observers(self):
+        # the first thread to enter is the last to leave, so a global observer would be
+        # restored out of order and each thread would count the other's calls
+        entered, inner_done = Barrier(2), Barrier(2)
+        results = {}
+
+        def run(name, count, exits_first):
+            with instrument() as observer:
+                entered.wait()
+                for _ in range(count):
+                    format_('{}', 1)
+                if exits_first:
+                    results[name] = observer
+                    inner_done.wait()
+                    return
+                inner_done.wait()
+                format_('{}', 1)
+                results[name] = observer
+            results[name + ' after'] = Instrumentation.active.get()
+
+        threads = [Thread(target=run, args=('a', 3, False)), Thread(target=run, args=('b', 5, True))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results['a'].stats()['phases']['render']['calls'], 4)
+        self.assertEqual(results['b'].stats()['phases']['render']['calls'], 5)
+        self.assertIsNone(results['a after'])
+        self.assertIsNone(Instrumentation.active.get())
\ No newline at end of file
@@ -1,8 +1,9 @@
 import unittest
 from string import digits
 
-from ..core.Lexer import Lexer
-from ..core.Node import Index, Replacement, FormatSpec
+from ..core.Lexer import Lexer, LexerException
+from ..core import format_
+from ..core.Node import Attribute, Index, Replacement, FormatSpec
 from ..core.Scanner import Scanner
 from ..core.Token import Token
 
@@ -60,6 +61,54 @@ class LexerTest(unittest.TestCase):
              Token('.', TokenEnum.punctuation), Token('>', TokenEnum.punctuation),
              Replacement.l_brace, Replacement.r_brace, Replacement.r_brace])
 
+    def test_long_literal(self):
+        text = 'abc {{ def }} ' * 5000
+        self.assertEqual(self.get_tokens(text + '{a}'),
+                         [Token(text, TokenEnum.literal), Replacement.l_brace,
+                          Token('a', TokenEnum.id), Replacement.r_brace])
+
+    def test_unmatched_close_brace(self):
+        self.assertRaises(LexerException, self.get_tokens, 'abc {{ }} } def')
+
+    def test_punctuation_is_interned(self):
+        tokens = self.get_tokens('{a:.>{}}')
+        self.assertIs(tokens[2], FormatSpec.colon)
+        self.assertIs(tokens[3], Token('.', TokenEnum.punctuation))
+        self.assertIsNot(Token('a', TokenEnum.id), Token('a', TokenEnum.id))
+        self.assertEqual(Token('a', TokenEnum.id), Token('a', TokenEnum.id))
+        self.assertNotEqual(Token('a', TokenEnum.id), Token('a', TokenEnum.literal))
+
+    def test_unicode(self):
+        self.assertEqual(self.get_tokens('héllo wörld\x00 {{日本}}\t'), [Token('héllo wörld\x00 {{日本}}\t', TokenEnum.literal)])
+        self.assertEqual(self.get_tokens('{имя.ñame_2}'), [Replacement.l_brace, Token('имя', TokenEnum.id), Attribute.period,
+                                                          Token('ñame_2', TokenEnum.id), Replacement.r_brace])
+        # a combining accent continues an identifier but cannot start one
+        self.assertEqual(self.get_tokens('{e\u0301x}')[1], Token('e\u0301x', TokenEnum.id))
+        self.assertEqual(self.get_tokens('{x\u2014y}')[1:4], [Token('x', TokenEnum.id), Token('\u2014', TokenEnum.punctuation),
+                                                               Token('y', TokenEnum.id)])
+        self.assertEqual(self.get_tokens('{a b}')[2], Token(' ', TokenEnum.punctuation))
+        self.assertEqual(Lexer.get_type('\u00b2'), TokenEnum.punctuation)
+        for format_str, args, kwargs in [('{日本:→^7}!', (), {'日本': 'ok'}), ('{}—{名前}', ('ß',), {'名前': 'ü'}),
+                                         ('{0:\u3000>4}', ('x',), {}), ('{e\u0301x}', (), {'e\u0301x': 1})]:
+            self.assertEqual(format_(format_str, *args, **kwargs), format_str.format(*args, **kwargs))
+
+    def test_deep_nesting(self):
+        depth = 5000
+        tokens = self.get_tokens(''.join('{%d:' % i for i in range(depth)) + '}' * depth)
+        self.assertEqual(len(tokens), 4 * depth)
+        self.assertEqual(tokens[:3], [Replacement.l_brace, Token(0, TokenEnum.integer), FormatSpec.colon])
+        self.assertEqual(tokens[-depth:], [Replacement.r_brace] * depth)
+        # the outer spec carries on after a nested field closes
+        self.assertEqual(self.get_tokens('{:{}5}')[-2], self.get_tokens('{:5}')[-2])
+
+    def test_scanner_match(self):
+        scanner = Scanner('abc42')
+        self.assertEqual(scanner.match(Lexer.id_rest), 'abc42')
+        self.assertEqual(scanner.peek(), None)
+        scanner = Scanner('0b101')
+        scanner.consume(2)
+        self.assertEqual(scanner.match(Lexer.binary_digits, 2), '0b101')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import tracemalloc
+import unittest
+from io import BytesIO
+from unittest import TestCase
+
+from ..core import render_file
+from ..core.Lexer import LexerException
+
+
+class MappedTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'template')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def render(self, text, *args, chunk_size=1 << 20, **kwargs):
+        with open(self.path, 'wb') as file:
+            file.write(text.encode('utf-8'))
+        output = BytesIO()
+        render_file(self.path, output, args, kwargs, chunk_size=chunk_size)
+        return output.getvalue().decode('utf-8')
+
+    def assertRenders(self, text, *args, **kwargs):
+        self.assertEqual(self.render(text, *args, **kwargs), text.format(*args, **kwargs))
+
+    def test_render(self):
+        self.assertRenders('héllo {} and {}, {{escaped}} {{{}}}\n', 'wörld', 2, 3)
+        self.assertRenders('{name:>{width}} {0.real!r} }}{{', 5, name='x', width=4)
+        self.assertRenders('')
+        self.assertRenders('no fields at all')
+        self.assertEqual(self.render('ab{}cd{{' * 100, *range(100), chunk_size=3),
+                         ''.join('ab{}cd{{'.format(i) for i in range(100)))
+
+    def test_numbering_carries_across_fields(self):
+        self.assertRenders('{} {:{}} {}', 'a', 'b', 3, 'c')
+        self.assertRaises(ValueError, self.render, '{} {0}', 1)
+        self.assertRaises(ValueError, self.render, '{0} {}', 1)
+
+    def test_errors(self):
+        self.assertRaises(LexerException, self.render, 'a } b')
+        self.assertRaises(LexerException, self.render, 'a { b')
+        self.assertRaises(IndexError, self.render, '{1}', 'a')
+
+    def test_buffer(self):
+        chunks = []
+        render_file(b'{}-{x}', chunks.append, (1,), {'x': 2})
+        self.assertEqual(b''.join(chunks), b'1-2')
+
+    def test_bounded_memory(self):
+        line = 'x' * 1000 + '{0}\n'
+        with open(self.path, 'w') as file:
+            for _ in range(8):
+                file.write(line * 1000)
+        tracemalloc.start()
+        try:
+            render_file(self.path, lambda chunk: None, ('field',), chunk_size=1 << 16)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 1 << 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import unittest
+from unittest import TestCase
+
+from ..core import compile_
+from ..core.Node import FieldName, FormatSpec, FormatString, Literal, Replacement
+from ..core.Optimizer import optimize
+
+
+class OptimizerTest(TestCase):
+    def test_unescape(self):
+        self.assertEqual(Literal('{{a}}{{{{').text, '{a}{{')
+        self.assertEqual(Literal('{{a}}', unescape=False).text, '{{a}}')
+
+    def test_merge_literals(self):
+        nodes = optimize([Literal('a'), Literal(''), Literal('b{{'), Replacement(FieldName(0)), Literal('c')])
+        self.assertEqual(nodes, [Literal('ab{', unescape=False), Replacement(FieldName(0)), Literal('c')])
+        self.assertEqual(optimize([Literal('')]), [])
+
+    def test_constant(self):
+        template = compile_('no {{fields}} here')
+        self.assertEqual(template.constant, 'no {fields} here')
+        self.assertEqual(template.format(1, a=2), 'no {fields} here')
+        self.assertEqual(compile_('').constant, '')
+        self.assertIsNone(compile_('a{}').constant)
+        self.assertEqual(template.compile().source, "def render(*args, **kwargs):\n    return 'no {fields} here'\n")
+
+    def test_fold(self):
+        template = compile_('{0} {unit!r} {{x}} {0:{fill}>{width}} {count:{width}}')
+        folded = template.fold(unit='cm', fill='*', width=4)
+        self.assertEqual(folded.nodes, (Replacement(FieldName(0)), Literal(" 'cm' {x} ", unescape=False),
+                                        Replacement(FieldName(0), format_spec=FormatSpec('*>4')), Literal(' '),
+                                        Replacement(FieldName('count'), format_spec=FormatSpec('4'))))
+        self.assertEqual(folded.format(7, count=3), template.format(7, unit='cm', fill='*', width=4, count=3))
+        self.assertEqual(folded.compile()(7, count=3), "7 'cm' {x} ***7    3")
+
+    def test_fold_everything(self):
+        folded = compile_('{a.real}-{b:>{c}}').fold(a=1, b='x', c=3)
+        self.assertEqual(folded.constant, '1-  x')
+        self.assertEqual(folded.nodes, (Literal('1-  x'),))
+
+    def test_fold_errors(self):
+        self.assertRaises(ValueError, compile_('{a:d}').fold, a='x')
+        self.assertRaises(ValueError, compile_('{a:{b}}').fold, a='x')
+        self.assertEqual(compile_('{a}').fold(b=1), compile_('{a}'))
+
+    def test_partial(self):
+        format_str = 'https://{host}/{0}/v{version}/{1.real}/{2:>{width}}/{1.real}'
+        template = compile_(format_str)
+        partial = template.partial('tenant', host='example.com', version=3)
+        self.assertEqual(partial, compile_('https://example.com/tenant/v3/{0.real}/{1:>{width}}/{0.real}'))
+        self.assertEqual(partial.positional, (0, 1))
+        self.assertEqual(partial.keywords, ('width',))
+        self.assertEqual(len(partial.shared), 1)
+        self.assertEqual(partial.format(5, 'x', width=3), format_str.format('tenant', 5, 'x', host='example.com',
+                                                                         version=3, width=3))
+        self.assertEqual(partial.compile()(5, 'x', width=3), 'https://example.com/tenant/v3/5/  x/5')
+
+    def test_partial_automatic_numbering(self):
+        template = compile_('{}-{}-{:{}}')
+        self.assertEqual(template.partial('a').format('b', 'c', 2), 'a-b-c ')
+        self.assertEqual(template.partial('a').partial('b').format('c', 3), 'a-b-c  ')
+        self.assertEqual(template.partial('a', 'b', 'c', 4).constant, 'a-b-c   ')
+        self.assertEqual(compile_('{1}{0}').partial('x').format('y'), 'yx')
+        self.assertRaises(ValueError, template.partial('a', 'b').partial, 'c')
+        self.assertRaises(ValueError, compile_('{0:{1}}').partial, 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
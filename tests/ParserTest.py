@@ -4,6 +4,7 @@ from unittest import TestCase
 from ..core.Lexer import Lexer
 from ..core.Parser import Parser, ParserException
 from ..core.Scanner import Scanner
+from ..core.TokenStream import TokenStream
 
 from ..core.Node import Literal, Replacement, FieldName, FormatString, Index, FormatSpec, Conversion
 
@@ -117,5 +118,51 @@ class ParserTest(TestCase):
                 [Literal('milk and '),
                  Replacement(FieldName(0), None, FormatSpec('.>{}', [Replacement(FieldName(1))]))]))
 
+    def test_nested_1(self):
+        parser = Parser(Scanner(self.get_tokens('{:{:{}}{}}')))
+        parser.parse()
+        self.assertEqual(
+            parser.format_string,
+            FormatString(
+                [Replacement(FieldName(0), None, FormatSpec('{}{}', [
+                    Replacement(FieldName(1), None, FormatSpec('{}', [Replacement(FieldName(2))])),
+                    Replacement(FieldName(3))]))]))
+
+    def test_deep_nesting(self):
+        depth = 5000
+        format_str = ''.join('{%d:' % i for i in range(depth)) + '}' * depth
+        format_string = Parser(Lexer(format_str).token_stream).parse()
+        self.assertEqual([field_name.argument for field_name in format_string.field_names()], list(range(depth)))
+
+    def test_token_stream(self):
+        for format_str in ['abc', '{} {abby} merry {} seion  ]]{bob}', 'milk and {2:{bob}{0}{1}}',
+                           '{{ aroe}} {{ {abrac[2][42][4]}}}']:
+            parser = Parser(Scanner(self.get_tokens(format_str)))
+            stream_parser = Parser(Lexer(format_str).token_stream)
+            self.assertEqual(stream_parser.parse(), parser.parse())
+
+    def test_token_stream_backup(self):
+        stream = TokenStream(iter('abc'))
+        self.assertEqual(stream.consume(2), 'b')
+        stream.backup()
+        self.assertEqual(stream.peek(), 'b')
+        self.assertEqual(stream.consume(3), None)
+        self.assertFalse(stream)
+        stream.backup(2)
+        self.assertEqual(stream.consume(), 'c')
+        self.assertRaises(IndexError, stream.backup, 3)
+
+    def test_token_stream_is_lazy(self):
+        consumed = []
+
+        def tokens():
+            for token in 'abc':
+                consumed.append(token)
+                yield token
+
+        stream = TokenStream(tokens())
+        self.assertEqual(stream.peek(), 'a')
+        self.assertEqual(consumed, ['a'])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
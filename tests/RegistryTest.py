@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from threading import Event, Thread
+from unittest import TestCase, mock
+
+from ..core import Registry, TemplateRegistry
+from ..core.Lexer import LexerException
+
+
+class RegistryTest(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+        os.mkdir(os.path.join(self.root, 'mail'))
+        self.write('greeting', 'hello {name}')
+        self.write('mail/footer', '-- {0}\n')
+        self.registry = TemplateRegistry(self.root, check_interval=0)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text, mtime_ns=None):
+        path = os.path.join(self.root, *name.split('/'))
+        with open(path + '.tmp', 'w', newline='') as file:
+            file.write(text)
+        if mtime_ns is not None:
+            os.utime(path + '.tmp', ns=(mtime_ns, mtime_ns))
+        os.replace(path + '.tmp', path)
+
+    def test_load(self):
+        self.assertEqual(self.registry.format('greeting', name='bob'), 'hello bob')
+        self.assertEqual(self.registry['mail/footer'].format('me'), '-- me\n')
+        self.assertEqual(self.registry.names(), ['greeting', 'mail/footer'])
+        self.assertIn('greeting', self.registry)
+        self.assertNotIn('missing', self.registry)
+        self.assertRaises(KeyError, self.registry.get, 'missing')
+        self.assertRaises(ValueError, self.registry.get, '../greeting')
+
+    def test_only_changed_templates_recompile(self):
+        template = self.registry.get('greeting')
+        self.registry.get('mail/footer')
+        self.assertIs(self.registry.get('greeting'), template)
+        self.assertEqual(self.registry.info().compiles, 2)
+
+        self.write('greeting', 'hi {name}!', mtime_ns=10 ** 18)
+        self.assertEqual(self.registry.refresh(), ['greeting'])
+        self.assertEqual(self.registry.format('greeting', name='bob'), 'hi bob!')
+        info = self.registry.info()
+        self.assertEqual((info.templates, info.compiles, info.reloads), (2, 3, 1))
+        self.assertGreater(info.last_reload, 0)
+        self.assertGreaterEqual(info.total_reload, info.max_reload)
+
+    def test_check_interval(self):
+        registry = TemplateRegistry(self.root, check_interval=3600)
+        registry.get('greeting')
+        self.write('greeting', 'changed {name}', mtime_ns=10 ** 18)
+        self.assertEqual(registry.format('greeting', name='bob'), 'hello bob')
+        registry.refresh()
+        self.assertEqual(registry.format('greeting', name='bob'), 'changed bob')
+
+    def test_deleted(self):
+        self.registry.get('greeting')
+        os.remove(os.path.join(self.root, 'greeting'))
+        self.assertRaises(KeyError, self.registry.get, 'greeting')
+        self.assertEqual(len(self.registry), 0)
+
+    def test_compile_errors_are_remembered(self):
+        self.write('broken', 'oops {', mtime_ns=10 ** 18)
+        self.assertRaises(LexerException, self.registry.get, 'broken')
+        self.assertRaises(LexerException, self.registry.get, 'broken')
+        self.assertEqual(self.registry.info().compiles, 1)
+        self.assertIsInstance(self.registry.errors()['broken'], LexerException)
+
+        self.write('broken', 'fixed {}', mtime_ns=10 ** 18 + 1)
+        self.assertEqual(self.registry.format('broken', 1), 'fixed 1')
+        self.write('broken', 'broken again {', mtime_ns=10 ** 18 + 2)
+        self.assertEqual(self.registry.refresh(), [])
+        self.assertEqual(self.registry.format('broken', 2), 'fixed 2')
+        self.assertEqual(self.registry.format('broken', 3), 'fixed 3')
+        self.assertEqual(list(self.registry.errors()), ['broken'])
+        info = self.registry.info()
+        self.assertEqual((info.compiles, info.reloads, info.failures), (3, 1, 2))
+
+        self.write('broken', 'fixed again {}', mtime_ns=10 ** 18 + 3)
+        self.assertEqual(self.registry.format('broken', 4), 'fixed again 4')
+        self.assertEqual(self.registry.errors(), {})
+
+    def test_slow_compile_does_not_block_other_names(self):
+        started, release = Event(), Event()
+        compile_ = Registry.compile_
+
+        def slow_compile(format_str):
+            if format_str.startswith('slow'):
+                started.set()
+                release.wait(10)
+            return compile_(format_str)
+
+        self.write('slow', 'slow {}')
+        with mock.patch.object(Registry, 'compile_', slow_compile):
+            thread = Thread(target=self.registry.get, args=('slow',))
+            thread.start()
+            self.assertTrue(started.wait(10))
+            try:
+                self.assertEqual(self.registry.format('greeting', name='bob'), 'hello bob')
+            finally:
+                release.set()
+                thread.join()
+        self.assertEqual(self.registry.format('slow', 1), 'slow 1')
+
+    def test_concurrent_readers(self):
+        results = set()
+        errors = []
+
+        def read():
+            try:
+                for _ in range(200):
+                    results.add(self.registry.format('greeting', name='x'))
+            except Exception as error:
+                errors.append(error)
+
+        threads = [Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(20):
+            self.write('greeting', 'v{} {{name}}'.format(i), mtime_ns=10 ** 18 + i)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(results, {'hello x'} | {'v{} x'.format(i) for i in range(20)})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
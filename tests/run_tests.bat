@@ -1,2 +1,2 @@
 cd ..\..
-py -m unittest formatter.tests.LexerTest formatter.tests.ParserTest formatter.tests.FormatStringTest
\ No newline at end of file
+py -m unittest formatter.tests.LexerTest formatter.tests.ParserTest formatter.tests.FormatStringTest formatter.tests.CacheTest formatter.tests.CompilerTest formatter.tests.ColumnarTest formatter.tests.FormatSpecTest formatter.tests.ConcurrencyTest formatter.tests.BundleTest formatter.tests.InstrumentationTest formatter.tests.OptimizerTest formatter.tests.RegistryTest formatter.tests.AsyncTest formatter.tests.MappedTest formatter.tests.FormatCacheTest formatter.tests.BytesTest
\ No newline at end of file
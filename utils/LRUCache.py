@@ -0,0 +1,81 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
+
+
+class LRUCache:
+    """
+    bounded mapping that evicts the least recently used entry once it
+    holds more than maxsize entries. A maxsize of None means unbounded
+    and a maxsize of 0 disables caching entirely.
+    """
+    def __init__(self, maxsize=128):
+        self.check_size(maxsize)
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def check_size(maxsize):
+        if maxsize is not None and maxsize < 0:
+            raise ValueError('maxsize must be None or >= 0, not {}'.format(maxsize))
+
+    def get(self, key, factory):
+        """
+        returns the entry for key, calling factory(key) to create it on a miss.
+        factory is called outside of the lock, so an exception it raises
+        leaves the cache untouched.
+        """
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = factory(key)
+
+        with self.lock:
+            if self.maxsize != 0:
+                self.entries[key] = value
+                self.entries.move_to_end(key)
+                self.evict()
+        return value
+
+    def evict(self):
+        """
+        must be called while holding self.lock
+        """
+        if self.maxsize is None:
+            return
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        self.check_size(maxsize)
+        with self.lock:
+            self.maxsize = maxsize
+            self.evict()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self):
+        with self.lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self.entries))
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
\ No newline at end of file
@@ -0,0 +1,64 @@
+# assigns a slot without the immutability check in ValueSlots.__setattr__. Constructors
+# use it for their own slots, which are always unset, so building nodes pays nothing for the guard.
+set_slot = object.__setattr__
+
+
+class ValueSlots:
+    """
+    base class for small value objects that keep their attributes in __slots__
+    instead of a per-instance __dict__. Two instances are equal when they are of
+    the same type and every slot holds an equal value, which is what
+    EqualityByValue gives dict-based classes, without sorting or copying a
+    __dict__ on every comparison.
+    Each slot can only be assigned once, so instances are immutable once
+    __init__ has run and can be shared freely, including between threads.
+    Subclasses assign their slots with set_slot rather than through the checked
+    __setattr__, which only guards against assignments from outside.
+    Slots listed in a subclass's derived_slots are computed in __init__ from the
+    others, so they are left out of comparisons, hashing and repr.
+    """
+    __slots__ = ()
+    slot_names = ()
+    derived_slots = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(name for name in klass.__dict__.get('__slots__', ())
+                         if name not in names and name not in cls.derived_slots)
+        cls.slot_names = tuple(names)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, name):
+            raise AttributeError('{} is immutable: cannot reassign {!r}'.format(type(self).__name__, name))
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError('{} is immutable: cannot delete {!r}'.format(type(self).__name__, name))
+
+    def values(self):
+        return tuple([getattr(self, name) for name in self.slot_names])
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is type(self):
+            return self.values() == other.values()
+        return NotImplemented
+
+    def __ne__(self, other):
+        if self is other:
+            return False
+        if type(other) is type(self):
+            return self.values() != other.values()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((type(self),) + self.values())
+
+    def __repr__(self):
+        values = ', '.join(
+            ''.join([name, ': ', repr(getattr(self, name))])
+            for name in self.slot_names)
+        return '<{}({})>'.format(type(self).__name__, values)
\ No newline at end of file
@@ -1 +1,3 @@
-from .EqualityByValue import EqualityByValue
\ No newline at end of file
+from .EqualityByValue import EqualityByValue
+from .LRUCache import LRUCache, CacheInfo
+from .ValueSlots import ValueSlots, set_slot
\ No newline at end of file